@@ -0,0 +1,88 @@
+// Archived conferences are not rendered into the page, each year of _data/conferences_archive is loaded on
+// demand from its bundle (python -m src bundle) and appended to the past events
+function createArchivedConfItem(conf) {
+  var subs = String(conf.sub || "").split(",").map(function (sub) { return sub.trim(); });
+  var item = $('<div class="ConfItem past"></div>')
+    .attr("id", conf.id)
+    .addClass(subs.map(function (sub) { return sub + "-conf"; }).join(" "))
+    .addClass((conf.ranking || "NA") + "-ranking");
+  var details = "{{site.baseurl}}/conference?id=" + encodeURIComponent(conf.id);
+  var title = (conf.full_name || "Deadline") + " Details";
+  var titleRow = $('<div class="row conf-row"></div>').appendTo(item);
+  $('<div class="col-6"></div>')
+    .append($('<span class="conf-title"></span>').append(
+      $("<a></a>").attr({ title: title, href: details }).text(conf.title + " " + conf.year)))
+    .append($('<span class="conf-title-small"></span>').append(
+      $("<a></a>").attr({ title: title, href: details }).text(conf.title + " '" + String(conf.year).slice(-2))))
+    .appendTo(titleRow);
+  $('<div class="col-6"></div>').appendTo(titleRow);
+
+  var infoRow = $('<div class="row"></div>').appendTo(item);
+  var meta = $('<div class="meta"></div>')
+    .append($('<span class="conf-date"></span>').text(conf.date + "."))
+    .append(" ")
+    .append($('<span class="conf-place"></span>').append(
+      $("<a></a>").attr("href", conf.place == "Online" ? "#" : "http://maps.google.com/?q=" + conf.place)
+        .text(conf.place)).append("."));
+  var left = $('<div class="col-12 col-sm-6"></div>').append(meta).appendTo(infoRow);
+  if (conf.note) {
+    $('<div class="note"></div>').append("<b>Note: </b>").append(document.createTextNode(conf.note))
+      .appendTo(left);
+  }
+  var deadlineTime = $('<span class="deadline-time"></span>');
+  $('<div class="col-12 col-sm-6"></div>')
+    .append($('<div class="deadline"></div>').append($("<div>Deadline: </div>").append(deadlineTime)))
+    .appendTo(infoRow);
+
+  var tagRow = $('<div class="col-12"></div>').appendTo($('<div class="row"></div>').appendTo(item));
+  subs.forEach(function (sub) {
+    $('<span class="conf-sub"></span>')
+      .attr({ title: "Click to only show " + sub + " conferences", "data-sub": sub })
+      .addClass(sub + "-tag")
+      .text(sub2name[sub] ? sub2name[sub].toLowerCase() : sub)
+      .appendTo(tagRow);
+  });
+  if (conf.ranking) {
+    var ranking = String(conf.ranking).replace("As", "A*");
+    $('<span class="conf-ranking"></span>')
+      .attr({ title: "Click to only show " + ranking + " conferences", "data-ranking": conf.ranking })
+      .text(ranking)
+      .appendTo(tagRow);
+  }
+  if (conf.hindex) {
+    $('<span title="H5 Index" class="conf-h5"></span>').text(conf.hindex).appendTo(tagRow);
+  }
+  item.append("<hr>");
+
+  if (!conf.deadline || conf.deadline == "TBA") {
+    deadlineTime.text("TBA");
+  } else {
+    var confDate = moment.tz(String(conf.deadline), conf.timezone || "America/New_York");
+    try {
+      deadlineTime.text(moment.tz(confDate, local_timezone).toString());
+    }
+    catch(err) {
+      deadlineTime.text(confDate.toString());
+    }
+    item.attr("diff", moment().diff(confDate));
+  }
+  return item;
+}
+
+$(".load-archive").click(function () {
+  var button = $(this);
+  button.prop("disabled", true);
+  $.getJSON(button.data("bundle"), function (data) {
+    data.forEach(function (conf) {
+      // the bundle holds all conferences of the year, including the ones rendered from conferences.yml
+      if (document.getElementById(conf.id) === null) {
+        createArchivedConfItem(conf).appendTo($("#past_confs"));
+      }
+    });
+    button.remove();
+    $("#sort-order-checkbox input").triggerHandler("click");
+    update_filtering({ subs: subs, all_subs: all_subs, rankings: rankings, all_rankings: all_rankings });
+  }).fail(function () {
+    button.prop("disabled", false);
+  });
+});
@@ -88,7 +88,8 @@
 function load_conference_list() {
   // Gather data
   var conf_list_all = [];
-  {% for conf in site.data.conferences %}
+  {% include all_conferences.html %}
+  {% for conf in all_conferences %}
     // add deadlines in red
     conf_list_all.push({
       id: "{{conf.id}}-deadline",
@@ -1,5 +1,4 @@
 var options = {
-  data: {{ site.data.conferences | jsonify }},
   getValue: function (element) {
     return element.title + " " + element.year;
   },
@@ -26,6 +25,16 @@ var options = {
   },
 };
 
+{% if site.data.bundles.search %}
+// search entries of all conferences from the bundle written by python -m src bundle, loaded once per page
 $(function () {
-  $("#search_bar").easyAutocomplete(options);
+  $.getJSON("{{ site.data.bundles.search | prepend: site.baseurl }}", function (data) {
+    $("#search_bar").easyAutocomplete($.extend({ data: data }, options));
+  });
 });
+{% else %}
+{% include all_conferences.html %}
+$(function () {
+  $("#search_bar").easyAutocomplete($.extend({ data: {{ all_conferences | jsonify }} }, options));
+});
+{% endif %}
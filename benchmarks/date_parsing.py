@@ -0,0 +1,104 @@
+"""
+Date parsing of src/scraping/dates.py against the previous try/except implementations.
+
+Usage: python -m benchmarks.date_parsing [--records 100000]
+"""
+import argparse
+import datetime
+import random
+import time
+
+import dateutil.parser
+
+from src.scraping.dates import (
+    parse_stored_datetime,
+    parse_scraped_datetime,
+    _parse_stored_datetime,
+    _parse_scraped_datetime,
+)
+
+
+def legacy_parse_stored_datetime(val):
+    # ConferenceDeadline.__post_init__ before src/scraping/dates.py
+    for dt_format in ["%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"]:
+        try:
+            if "/" in val:
+                dt_format = dt_format.replace("-", "/")
+            d = datetime.datetime.strptime(val, dt_format)
+            break
+        except:
+            d = None
+    return d
+
+
+def legacy_get_datetime(datetime_string):
+    # src.scraping.utils.get_datetime before src/scraping/dates.py
+    date = None
+    for format in ["%y/%d/%m %h:%m", "%m/%d/%Y %H:%M", "%m/%d/%Y"]:
+        try:
+            date = datetime.datetime.strptime(datetime_string.strip(), format)
+            break
+        except Exception:
+            pass
+    if date is None:
+        try:
+            date = dateutil.parser.parse(datetime_string)
+        except Exception:
+            pass
+    return date
+
+
+def generate_values(records: int, rng: random.Random):
+    stored, scraped = [], []
+    for _ in range(records):
+        day = datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randint(0, 2000))
+        stored += [
+            f"{day:%Y-%m-%d} 23:59",  # deadline
+            f"{day:%Y-%m-%d} 23:59",  # abstract_deadline
+            f"{day:%Y-%m-%d}",  # start
+            f"{day:%Y-%m-%d}",  # end
+        ]
+        scraped += [f"{day:%b} {day.day}, {day.year}", f"{day:%m/%d/%Y}"]
+    return stored, scraped
+
+
+def measure(function, values):
+    start = time.perf_counter()
+    result = [function(v) for v in values]
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+    stored, scraped = generate_values(args.records, random.Random(0))
+
+    for name, legacy, new, cached, values in [
+        (
+            "stored",
+            legacy_parse_stored_datetime,
+            parse_stored_datetime,
+            _parse_stored_datetime,
+            stored,
+        ),
+        (
+            "scraped",
+            legacy_get_datetime,
+            parse_scraped_datetime,
+            _parse_scraped_datetime,
+            scraped,
+        ),
+    ]:
+        legacy_time, legacy_result = measure(legacy, values)
+        cached.cache_clear()
+        new_time, new_result = measure(new, values)
+        assert legacy_result == new_result, f"{name} dates differ"
+        print(
+            f"{name:<8} {len(values):>8} values  legacy {legacy_time:6.2f} s  "
+            f"new {new_time:6.2f} s  ({legacy_time / new_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Synthetic conferences.yml and master_data.csv files for the benchmarks, the same seed gives the same files.
+
+Usage: python -m benchmarks.generators <directory> [--records 1000 10000 100000] [--master-data 1000 10000]
+"""
+import argparse
+import random
+from pathlib import Path
+
+from benchmarks.matching import generate_master_data
+from benchmarks.models import generate_records
+from src.io import save_csv, save_yaml
+
+master_data_columns = ["title", "full_name", "wikicfp_query", "wikicfp_link", "sub"]
+
+
+def write_conferences(path: Path, records: int, seed=0) -> Path:
+    data = generate_records(records, random.Random(seed))
+    for i, conf in enumerate(data):  # ids are unique in real data
+        conf["id"] = f"{conf['title'].lower()}-{i}{str(conf['year'])[2:]}"
+    save_yaml(path, data)
+    return path
+
+
+def write_master_data(path: Path, size: int, seed=0) -> Path:
+    rng = random.Random(seed)
+    rows = [
+        {
+            "title": conference.title,
+            "full_name": conference.full_name,
+            "wikicfp_query": conference.title.upper(),
+            "wikicfp_link": "",
+            "sub": rng.choice(["ML", "CV", "NLP", "RO"]),
+        }
+        for conference in generate_master_data(size, rng)
+    ]
+    save_csv(path, rows, key_order=master_data_columns)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--records", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--master-data", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+    args.directory.mkdir(parents=True, exist_ok=True)
+    for records in args.records:
+        print(write_conferences(args.directory / f"conferences_{records}.yml", records))
+    for size in args.master_data:
+        print(write_master_data(args.directory / f"master_data_{size}.csv", size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Per-page parse time of the HTML parser backends on the saved fixture pages.
+
+Usage: python -m benchmarks.html_parsing
+"""
+import timeit
+from pathlib import Path
+
+from src.scraping.core_conference_rankings import parse_core_ratings
+from src.scraping.parsing import html_parser_backends
+from src.scraping.wikicfp_deadlines import parse_conference_candidates, parse_event_page
+
+fixtures_dir = Path(__file__).parent / "fixtures"
+
+parsers = {
+    "wikicfp_search.html": lambda page, backend: parse_conference_candidates(
+        page, 1, backend
+    ),
+    "wikicfp_event.html": lambda page, backend: parse_event_page(
+        page, "http://wikicfp.com/cfp/servlet/event.showcfp?eventid=1", backend
+    ),
+    "core_search.html": lambda page, backend: parse_core_ratings(page, backend),
+}
+
+
+def main(repeat=20):
+    print(f"{'fixture':<22}{'backend':<10}{'ms/page':>10}")
+    for fixture, parse in parsers.items():
+        page = (fixtures_dir / fixture).read_bytes()
+        expected = parse(page, "soup")
+        for backend in html_parser_backends:
+            assert parse(page, backend) == expected, f"{backend} differs on {fixture}"
+            seconds = min(
+                timeit.repeat(lambda: parse(page, backend), number=1, repeat=repeat)
+            )
+            print(f"{fixture:<22}{backend:<10}{seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+End-to-end load test of python -m src scrape against benchmarks.mock_server on one machine.
+
+Usage: python -m benchmarks.load_test [--series 1000] [--workers 16] [--latency 0.2] [--jitter 0.1]
+                                      [--error-rate 0.01] [--rate-limit 50] [--request-interval 0.1]
+                                      [--directory DIR]
+Generates master data with --series series, starts one mock server for WikiCFP and one for CORE on separate
+ports (so each site has its own per-host rate limit in the scraper, with --request-interval seconds instead of
+the 5 s of the real sites) and runs a full scrape in a subprocess with its data and cache directories in
+--directory (default: a temporary directory), then prints the run report.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from benchmarks.generators import write_master_data
+from benchmarks.mock_server import create_server, load_series
+from src.config import project_root
+from src.io import save_yaml
+
+
+def run_load_test(directory: Path, args) -> dict:
+    data_dir, cache_dir = directory / "data", directory / "cache"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    master_data_path = write_master_data(data_dir / "master_data.csv", args.series)
+    save_yaml(data_dir / "conferences.yml", [])
+
+    series = load_series(master_data_path)
+    servers = [
+        create_server(
+            series,
+            0,  # any free port
+            args.latency,
+            args.jitter,
+            args.error_rate,
+            args.rate_limit,
+        )
+        for _ in range(2)
+    ]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    wikicfp_url, core_url = [f"http://127.0.0.1:{s.server_address[1]}" for s in servers]
+    env = {
+        **os.environ,
+        "DEADLINES_DATA_DIR": str(data_dir),
+        "DEADLINES_CACHE_DIR": str(cache_dir),
+        "DEADLINES_WIKICFP_URL": wikicfp_url,
+        "DEADLINES_CORE_URL": core_url,
+        "DEADLINES_SCRAPE_WORKERS": str(args.workers),
+        "DEADLINES_REQUEST_INTERVAL": str(args.request_interval),
+    }
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "src", "--timings", "scrape", "--full", "--restart"],
+            cwd=project_root,
+            env=env,
+            check=True,
+        )
+    finally:
+        for server in servers:
+            server.shutdown()
+    with open(cache_dir / "scrape_report.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--rate-limit", type=int, help="requests per second before 429 responses")
+    parser.add_argument(
+        "--request-interval", type=float, default=0.1, help="seconds between requests per site"
+    )
+    parser.add_argument("--directory", type=Path, help="keep data, cache and report in this directory")
+    args = parser.parse_args()
+
+    if args.directory is None:
+        with tempfile.TemporaryDirectory() as directory:
+            report = run_load_test(Path(directory), args)
+    else:
+        report = run_load_test(args.directory, args)
+
+    duration = report["duration_seconds"]
+    print(
+        f"{report['series']} series in {duration:.1f} s ({report['series'] / duration:.1f} series/s), "
+        f"{report['new_deadlines']} new deadlines"
+    )
+    for name, stage in report["stages"].items():
+        print(f"{name:<14}{stage['count']:>7} calls {stage['seconds']:>10.1f} s")
+    for host, metrics in report["hosts"].items():
+        latency = metrics["latency_seconds"]
+        print(
+            f"{host}: {metrics['requests']} requests, {metrics['retries']} retries, "
+            f"{metrics['errors']} errors, statuses {metrics['statuses']}, "
+            f"latency p50 {latency['p50']:.3f} s p90 {latency['p90']:.3f} s p99 {latency['p99']:.3f} s, "
+            f"sleep {metrics['sleep_seconds']}"
+        )
+    print(f"counters: {report['counters']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+MatchIndex against pairwise compute_conference_match_score on synthetic master data and WikiCFP candidates.
+
+Usage: python -m benchmarks.matching [--size 10000] [--queries 10000] [--naive-queries 50]
+The naive time for all queries is extrapolated from --naive-queries queries.
+"""
+import argparse
+import random
+import time
+
+from src.scraping.matching import MatchIndex, compute_conference_match_score
+from src.scraping.models import ConferenceMasterData, ConferenceCandidateCFP
+
+topics = (
+    "learning vision robotics language speech data mining graphics security networks systems "
+    "databases software theory algorithms optimization intelligence agents knowledge semantic web "
+    "retrieval multimedia signal processing pattern recognition computing cloud distributed parallel "
+    "embedded mobile wireless sensor quantum bioinformatics medical imaging automation control human "
+    "interaction autonomous vehicles logic verification programming compilers architecture hardware"
+).split()
+kinds = [
+    "International Conference on",
+    "Workshop on",
+    "Symposium on",
+    "IEEE Conference on",
+    "ACM Conference on",
+    "European Conference on",
+    "Asian Conference on",
+    "International Journal of",
+]
+
+
+def generate_full_name(rng: random.Random) -> str:
+    words = rng.sample(topics, rng.randint(2, 4))
+    return f"{rng.choice(kinds)} {' '.join(words).title()}"
+
+
+def generate_master_data(size: int, rng: random.Random):
+    return [
+        ConferenceMasterData(
+            title="".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 6))),
+            full_name=generate_full_name(rng),
+        )
+        for _ in range(size)
+    ]
+
+
+def generate_candidates(size: int, conferences, rng: random.Random):
+    """
+    30% of the candidates are (noisy) copies of master data names
+    """
+    candidates = []
+    for _ in range(size):
+        if rng.random() < 0.3:
+            full_name = rng.choice(conferences).full_name
+            full_name = rng.choice(["IEEE--", "ACM ", ""]) + full_name
+        else:
+            full_name = generate_full_name(rng)
+        candidates.append(ConferenceCandidateCFP(full_name=full_name))
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=10000)
+    parser.add_argument("--naive-queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    conferences = generate_master_data(args.size, rng)
+    candidates = generate_candidates(args.queries, conferences, rng)
+
+    start = time.perf_counter()
+    index = MatchIndex.from_master_data(conferences)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    index_scores = index.match_candidates(candidates)
+    index_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive_scores = []
+    for candidate in candidates[: args.naive_queries]:
+        scores = {}
+        for i, conference in enumerate(conferences):
+            score = compute_conference_match_score(conference, candidate)
+            if score > 0:
+                scores[i] = score
+        naive_scores.append(scores)
+    naive_time = (time.perf_counter() - start) / args.naive_queries * args.queries
+    assert naive_scores == index_scores[: args.naive_queries], "decisions differ"
+
+    print(f"{args.size} master data x {args.queries} candidates")
+    print(f"index build:       {build_time:8.2f} s")
+    print(f"index match:       {index_time:8.2f} s")
+    print(f"pairwise (extrap.): {naive_time:7.2f} s")
+    print(f"speedup:           {naive_time / (build_time + index_time):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Local stand-in for WikiCFP and the CORE portal. Search results, event pages and CORE result pages are generated
+from the pages in benchmarks/fixtures for the series of a master data csv, with configurable latency, error rate
+and rate limit.
+
+Usage: python -m benchmarks.mock_server [--master-data _data/master_data.csv] [--port 8000] [--latency 0.2]
+                                        [--jitter 0.1] [--error-rate 0.01] [--rate-limit 20]
+The scraper uses it with
+    DEADLINES_WIKICFP_URL=http://127.0.0.1:8000 DEADLINES_CORE_URL=http://127.0.0.1:8001 python -m src scrape
+with one server per site (each server serves the pages of both), so the scraper keeps one rate limit per site.
+See benchmarks/load_test.py for a complete run with separate data and cache directories.
+"""
+import argparse
+import datetime
+import html
+import random
+import re
+import threading
+import time
+import urllib.parse
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.html_parsing import fixtures_dir
+from src.config import csv_path_master_data
+from src.io import load_csv
+
+core_page_size = 50
+core_ranks = ["A*", "A", "B", "C"]
+# editions per series in the search results, relative to the current year
+edition_years = [-1, 0, 1]
+max_search_results = 20
+
+
+def split_fixture(page: str, head_end: str, rows_end: str) -> Tuple[str, str]:
+    """
+    Text of page up to the end of the table header head_end and from the end of the table rows_end on
+    """
+    head = page.index(head_end) + len(head_end)
+    return page[:head], page[page.index(rows_end, head) :]
+
+
+class MockSite:
+    """
+    Pages of both sites for a list of series (dicts with title, full_name and wikicfp_query)
+    """
+
+    def __init__(self, series: List[Dict], year: int = None):
+        self.series = series
+        self.year = datetime.date.today().year if year is None else year
+        search_page = (fixtures_dir / "wikicfp_search.html").read_text(encoding="utf-8")
+        self.search_head, self.search_tail = split_fixture(
+            search_page, "Deadline</td></tr>", "</table>"
+        )
+        self.event_page = (fixtures_dir / "wikicfp_event.html").read_text(encoding="utf-8")
+        core_page = (fixtures_dir / "core_search.html").read_text(encoding="utf-8")
+        self.core_head, self.core_tail = split_fixture(
+            core_page, "<th>Average Rating</th>\n</tr>", "</table>"
+        )
+
+    def get_event_id(self, series_id: int, year: int) -> int:
+        return 100000 + series_id * 10 + year % 10
+
+    def search(self, query: str) -> str:
+        query = query.lower()
+        matches = [
+            i
+            for i, s in enumerate(self.series)
+            if query in s["wikicfp_query"].lower() or query in s["title"].lower()
+        ]
+        # exact matches first, like the real search
+        matches.sort(key=lambda i: self.series[i]["wikicfp_query"].lower() != query)
+        rows = []
+        for i in matches[: max_search_results // len(edition_years)]:
+            series = self.series[i]
+            acronym = html.escape(series["wikicfp_query"] or series["title"].upper())
+            full_name = html.escape(series["full_name"])
+            for offset in edition_years:
+                year = self.year + offset
+                color = "#e6e6e6" if len(rows) % 2 == 0 else "#f6f6f6"
+                link = f"/cfp/servlet/event.showcfp?eventid={self.get_event_id(i, year)}&amp;copyownerid=1"
+                rows.append(
+                    f'<tr bgcolor="{color}">\n'
+                    f'<td rowspan="2" align="left"><a href="{link}">{acronym} {year}</a></td>\n'
+                    f'<td align="left" colspan="3">{full_name}</td>\n</tr>\n'
+                    f'<tr bgcolor="{color}">\n<td align="left">Dec 1, {year} - Dec 5, {year}</td>\n'
+                    f'<td align="left">Vienna, Austria</td>\n<td align="left">Mar 20, {year}</td>\n</tr>\n'
+                )
+        head = re.sub(
+            r'name="q" value="[^"]*"', f'name="q" value="{html.escape(query)}"', self.search_head
+        )
+        return head + "\n" + "".join(rows) + self.search_tail
+
+    def event(self, event_id: int) -> Optional[str]:
+        series_id, year_digit = divmod(event_id - 100000, 10)
+        if not 0 <= series_id < len(self.series):
+            return None
+        year = next(
+            (self.year + o for o in edition_years if (self.year + o) % 10 == year_digit), None
+        )
+        if year is None:
+            return None
+        series = self.series[series_id]
+        acronym = series["wikicfp_query"] or series["title"].upper()
+        return (
+            self.event_page.replace(
+                "International Conference on Pattern Recognition", html.escape(series["full_name"])
+            )
+            .replace("https://icpr2024.org/", f"https://{series['title']}{year}.org/")
+            .replace("ICPR 2024", html.escape(f"{acronym} {year}"))
+            .replace("2024", str(year))
+        )
+
+    def core_search(self, query: str, source: str, page: int) -> str:
+        query = query.lower()
+        matches = [
+            i
+            for i, s in enumerate(self.series)
+            if query in s["full_name"].lower() or query in s["title"].lower()
+        ]
+        rows = []
+        for n, i in enumerate(matches[(page - 1) * core_page_size : page * core_page_size]):
+            series = self.series[i]
+            rank = core_ranks[zlib.crc32(series["title"].encode("utf-8")) % len(core_ranks)]
+            cells = [
+                series["full_name"],
+                series["title"].upper(),
+                source,
+                rank,
+                "Yes",
+                "No",
+                "4611",
+                "",
+                "",
+            ]
+            row_class = "oddrow" if n % 2 == 0 else "evenrow"
+            rows.append(
+                f'<tr class="{row_class}" onclick="navigate(\'/conf-ranks/{i}/\');">\n'
+                + "".join(f"<td >{html.escape(c)}</td>\n" for c in cells)
+                + "</tr>\n"
+            )
+        head = re.sub(r"Showing results [^<]*", f"Showing results of {len(matches)}", self.core_head)
+        return head + "\n" + "".join(rows) + self.core_tail
+
+
+class RateLimiter:
+    """
+    At most limit requests in any second, None for no limit
+    """
+
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self.times = deque()
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if self.limit is None:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            while self.times and self.times[0] <= now - 1:
+                self.times.popleft()
+            if len(self.times) >= self.limit:
+                return False
+            self.times.append(now)
+            return True
+
+
+def create_server(
+    series: List[Dict],
+    port=8000,
+    latency=0.0,
+    jitter=0.0,
+    error_rate=0.0,
+    rate_limit: int = None,
+    host="127.0.0.1",
+) -> ThreadingHTTPServer:
+    """
+    Server for the pages of series, each response is delayed by latency plus up to jitter seconds. A request is
+    answered with 503 with probability error_rate and with 429 if rate_limit requests arrived in the last second.
+    Call serve_forever, e.g. in a thread, and shutdown.
+    """
+    site = MockSite(series)
+    limiter = RateLimiter(rate_limit)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive like the real sites
+
+        def do_GET(self):
+            time.sleep(latency + random.uniform(0, jitter))
+            if not limiter.allow():
+                return self.respond(429, "rate limited", {"Retry-After": "1"})
+            if random.random() < error_rate:
+                return self.respond(503, "unavailable")
+            url = urllib.parse.urlsplit(self.path)
+            params = {k: v[0] for k, v in urllib.parse.parse_qs(url.query).items()}
+            body = None
+            if url.path == "/cfp/servlet/tool.search":
+                body = site.search(params.get("q", ""))
+            elif url.path == "/cfp/servlet/event.showcfp" and params.get("eventid", "").isdigit():
+                body = site.event(int(params["eventid"]))
+            elif url.path == "/conf-ranks/":
+                page = params.get("page", "1")
+                body = site.core_search(
+                    params.get("search", ""),
+                    params.get("source", ""),
+                    int(page) if page.isdigit() else 1,
+                )
+            if body is None:
+                return self.respond(404, "not found")
+            self.respond(200, body)
+
+        def respond(self, status: int, body: str, headers: Dict[str, str] = None):
+            content = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=UTF-8")
+            self.send_header("Content-Length", str(len(content)))
+            for key, val in (headers or {}).items():
+                self.send_header(key, val)
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def load_series(path: Path) -> List[Dict]:
+    return [
+        {"title": r["title"], "full_name": r["full_name"], "wikicfp_query": r["wikicfp_query"]}
+        for r in load_csv(path)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--master-data", type=Path, default=csv_path_master_data)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.1, help="additional random seconds")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="share of 503 responses")
+    parser.add_argument("--rate-limit", type=int, help="requests per second before 429 responses")
+    args = parser.parse_args()
+    server = create_server(
+        load_series(args.master_data),
+        args.port,
+        args.latency,
+        args.jitter,
+        args.error_rate,
+        args.rate_limit,
+    )
+    print(f"serving on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
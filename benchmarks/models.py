@@ -0,0 +1,74 @@
+"""
+Load time and memory per record of ConferenceDeadline for synthetic records.
+
+Usage: python -m benchmarks.models [--records 100000]
+"""
+import argparse
+import datetime
+import random
+import time
+import tracemalloc
+
+from src.scraping.models import ConferenceDeadline
+
+
+def generate_records(records: int, rng: random.Random):
+    data = []
+    for i in range(records):
+        start = datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randint(0, 2000))
+        deadline = start - datetime.timedelta(days=rng.randint(60, 200))
+        title = f"CONF{i % 5000}"
+        year = start.year
+        data.append(
+            {
+                "title": title,
+                "year": year,
+                "id": f"{title.lower()}{str(year)[2:]}",
+                "full_name": f"International Conference number {i % 5000}",
+                "link": f"https://conf{i % 5000}.org/{year}/",
+                "deadline": f"{deadline:%Y-%m-%d} 23:59",
+                "timezone": "UTC-12",
+                "place": "Vienna, Austria",
+                "date": f"{start:%B} {start.day} - {start.day + 3}, {year}",
+                "start": f"{start:%Y-%m-%d}",
+                "end": f"{start + datetime.timedelta(days=3):%Y-%m-%d}",
+                "hindex": rng.randint(10, 300),
+                "sub": rng.choice(["ML", "CV", "NLP", "RO"]),
+                "ranking": rng.choice(["A*", "A", "B", "C"]),
+            }
+        )
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+    data = generate_records(args.records, random.Random(0))
+
+    start = time.perf_counter()
+    conferences = [ConferenceDeadline(**d) for d in data]
+    load_time = time.perf_counter() - start
+    del conferences
+
+    tracemalloc.start()
+    conferences = [ConferenceDeadline(**d) for d in data]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    conferences.sort(key=lambda c: c.deadline)
+    sort_time = time.perf_counter() - start
+    start = time.perf_counter()
+    dicts = [c.as_dict() for c in conferences]
+    serialize_time = time.perf_counter() - start
+
+    print(f"{args.records} records")
+    print(f"load:        {load_time:6.2f} s")
+    print(f"memory:      {memory / args.records:6.0f} bytes/record")
+    print(f"sort:        {sort_time:6.2f} s (first access of deadline)")
+    print(f"as_dict:     {serialize_time:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
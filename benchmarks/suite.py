@@ -0,0 +1,219 @@
+"""
+Times each stage of the data tools separately on synthetic data of several sizes and on the saved HTML fixtures.
+Every run is appended to benchmarks/results.jsonl with its commit and compared with the last stored run
+of another commit, stages slower than --threshold times that run are marked. The file is tracked, commit the
+runs which should serve as reference for later commits.
+
+Usage: python -m benchmarks.suite [--sizes 1000 10000 100000] [--master-data-sizes 1000 10000]
+                                  [--stages load_yaml sort_data ...] [--repeat 3] [--threshold 1.2] [--no-save]
+Sizes are the number of conferences, for the match_* stages the number of master data series.
+"""
+import argparse
+import datetime
+import json
+import platform
+import random
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.generators import write_conferences, write_master_data
+from benchmarks.html_parsing import fixtures_dir, parsers
+from benchmarks.matching import generate_candidates
+from src.config import cache_dir, html_parser_backend, project_root
+from src.io import get_yaml_snapshot_path, load_csv, load_yaml, save_yaml
+from src.scraping.matching import MatchIndex, compute_conference_match_score
+from src.scraping.models import ConferenceDeadline, ConferenceMasterData
+from src.tools.sort_data import sort_data
+
+data_dir = cache_dir / "benchmarks" / "data"
+results_path = Path(__file__).parent / "results.jsonl"
+# candidates matched by both match_* stages, so their seconds compare
+match_queries = 20
+
+
+def get_conferences_path(size: int) -> Path:
+    path = data_dir / f"conferences_{size}.yml"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_conferences(path, size)
+    return path
+
+
+def get_master_data(size: int) -> List[ConferenceMasterData]:
+    path = data_dir / f"master_data_{size}.csv"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_master_data(path, size)
+    return [ConferenceMasterData(**row) for row in load_csv(path)]
+
+
+# A stage prepares its input (not timed) and returns the function which is timed
+
+
+def setup_load_yaml(size: int) -> Callable:
+    path = get_conferences_path(size)
+
+    def run():
+        get_yaml_snapshot_path(path).unlink(missing_ok=True)
+        return load_yaml(path)
+
+    return run
+
+
+def setup_load_yaml_snapshot(size: int) -> Callable:
+    path = get_conferences_path(size)
+    load_yaml(path)
+    return lambda: load_yaml(path)
+
+
+def setup_models(size: int) -> Callable:
+    data = load_yaml(get_conferences_path(size))
+    return lambda: [ConferenceDeadline(**d) for d in data]
+
+
+def setup_sort_data(size: int) -> Callable:
+    path = get_conferences_path(size)
+    return lambda: sort_data(path, overwrite=False)
+
+
+def setup_save_yaml(size: int) -> Callable:
+    path = data_dir / f"conferences_{size}_saved.yml"
+    data = [dict(d) for d in load_yaml(get_conferences_path(size))]
+    save_yaml(path, data)
+    runs = iter(range(10 ** 9))
+
+    def run():  # one changed record per save, like an edit by a tool
+        data[len(data) // 2]["note"] = f"edit {next(runs)}"
+        save_yaml(path, data)
+
+    return run
+
+
+def setup_match_index(size: int) -> Callable:
+    conferences = get_master_data(size)
+    candidates = generate_candidates(match_queries, conferences, random.Random(1))
+    return lambda: MatchIndex.from_master_data(conferences).match_candidates(candidates)
+
+
+def setup_match_pairwise(size: int) -> Callable:
+    conferences = get_master_data(size)
+    candidates = generate_candidates(match_queries, conferences, random.Random(1))
+    return lambda: [
+        [compute_conference_match_score(c, candidate) for c in conferences]
+        for candidate in candidates
+    ]
+
+
+def get_setup_parse(fixture: str) -> Callable:
+    def setup(size: Optional[int]) -> Callable:
+        page = (fixtures_dir / fixture).read_bytes()
+        return lambda: parsers[fixture](page, html_parser_backend)
+
+    return setup
+
+
+conference_stages: Dict[str, Callable] = {
+    "load_yaml": setup_load_yaml,
+    "load_yaml_snapshot": setup_load_yaml_snapshot,
+    "models": setup_models,
+    "sort_data": setup_sort_data,
+    "save_yaml": setup_save_yaml,
+}
+master_data_stages: Dict[str, Callable] = {
+    "match_index": setup_match_index,
+    "match_pairwise": setup_match_pairwise,
+}
+fixture_stages: Dict[str, Callable] = {
+    f"parse_{Path(fixture).stem}": get_setup_parse(fixture) for fixture in parsers
+}
+
+
+def get_commit() -> str:
+    def git(*args) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        commit = git("rev-parse", "--short", "HEAD")
+        return commit + ("-dirty" if git("status", "--porcelain", "--untracked-files=no") else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_previous_run(commit: str) -> Optional[Dict]:
+    try:
+        with open(results_path, encoding="utf-8") as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return None
+    return next((run for run in reversed(runs) if run["commit"] != commit), None)
+
+
+def time_stage(setup: Callable, size: Optional[int], repeat: int) -> float:
+    run = setup(size)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    stage_names = list(conference_stages) + list(master_data_stages) + list(fixture_stages)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--master-data-sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--stages", nargs="+", choices=stage_names, default=stage_names)
+    parser.add_argument("--repeat", type=int, default=3, help="the fastest repetition is kept")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--no-save", action="store_true", help="do not store the results")
+    args = parser.parse_args()
+
+    commit = get_commit()
+    previous = load_previous_run(commit)
+    previous_results = previous["results"] if previous else {}
+    print(
+        f"commit {commit}, compared with {previous['commit'] if previous else '-'}\n"
+        f"{'stage':<34}{'seconds':>10}{'previous':>10}{'ratio':>8}"
+    )
+    results = {}
+    for name in args.stages:
+        if name in conference_stages:
+            keys = [(f"{name}/{size}", size) for size in args.sizes]
+            setup = conference_stages[name]
+        elif name in master_data_stages:
+            keys = [(f"{name}/{size}", size) for size in args.master_data_sizes]
+            setup = master_data_stages[name]
+        else:
+            keys = [(name, None)]
+            setup = fixture_stages[name]
+        for key, size in keys:
+            seconds = results[key] = time_stage(setup, size, args.repeat)
+            line = f"{key:<34}{seconds:>10.4f}"
+            if key in previous_results:
+                ratio = seconds / previous_results[key]
+                line += f"{previous_results[key]:>10.4f}{ratio:>7.2f}x"
+                if ratio > args.threshold:
+                    line += "  slower"
+            print(line, flush=True)
+
+    if not args.no_save:
+        run = {
+            "commit": commit,
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(results_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+        print(f"results stored in {results_path}")
+
+
+if __name__ == "__main__":
+    main()
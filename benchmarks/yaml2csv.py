@@ -0,0 +1,108 @@
+"""
+Time and peak memory of the yaml <-> csv conversion on a synthetic conferences file, compared with the
+previous implementations (whole file in memory, pandas for csv -> yaml, skipped if it is not installed).
+
+Usage: python -m benchmarks.yaml2csv [--rows 1000000] [--legacy-rows 20000]
+"""
+import argparse
+import importlib.util
+import multiprocessing
+import random
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from benchmarks.models import generate_records
+from src.io import dump_yaml, save_csv
+from src.tools.yaml2csv import convert_csv_to_yaml, convert_yaml_to_csv
+
+
+def write_synthetic_yaml(path: Path, rows: int, chunk_size=10000):
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as file:
+        for start in range(0, rows, chunk_size):
+            dump_yaml(generate_records(min(chunk_size, rows - start), rng), file)
+
+
+def legacy_convert_yaml_to_csv(yaml_path, csv_path):
+    with open(yaml_path, encoding="utf-8") as f:
+        data = yaml.load(f, Loader=yaml.SafeLoader)
+    key_order = list(set(sum([list(d.keys()) for d in data], [])))
+    save_csv(csv_path, data, key_order)
+
+
+def legacy_convert_csv_to_yaml(csv_path, yaml_path):
+    import pandas as pd
+
+    data = pd.read_csv(csv_path, encoding="utf-8").fillna("")
+    data = data.to_dict("records")
+    for conf in data:
+        for key in [key for key, val in conf.items() if val == ""]:
+            del conf[key]
+        for key, val in conf.items():
+            if isinstance(val, float):
+                conf[key] = int(val)
+    with open(yaml_path, "w") as output_file:
+        yaml.safe_dump(data, output_file, sort_keys=False)
+
+
+def run(function, args, results):
+    start = time.perf_counter()
+    function(*args)
+    duration = time.perf_counter() - start
+    results.put((duration, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def measure(name, function, *args):
+    """
+    Runs function in a fresh process, so the peak memory is its own
+    """
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run, args=(function, args, results))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        print(f"{name:32} failed")
+        return
+    duration, peak_memory = results.get()
+    print(f"{name:32} {duration:8.2f} s {peak_memory:8.0f} MB peak")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--legacy-rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        for rows in sorted({args.legacy_rows, args.rows} - {0}):
+            yaml_path = directory / f"conferences_{rows}.yml"
+            csv_path = directory / f"conferences_{rows}.csv"
+            write_synthetic_yaml(yaml_path, rows)
+            print(f"{rows} rows, {yaml_path.stat().st_size / 1024 ** 2:.0f} MB yaml")
+            measure("yaml -> csv", convert_yaml_to_csv, yaml_path, csv_path)
+            measure("csv -> yaml", convert_csv_to_yaml, csv_path, directory / "out.yml")
+            if rows <= args.legacy_rows:
+                measure(
+                    "yaml -> csv (previous)",
+                    legacy_convert_yaml_to_csv,
+                    yaml_path,
+                    directory / "legacy.csv",
+                )
+                if importlib.util.find_spec("pandas") is None:
+                    print(f"{'csv -> yaml (previous, pandas)':32} skipped, pandas is not installed")
+                    continue
+                measure(
+                    "csv -> yaml (previous, pandas)",
+                    legacy_convert_csv_to_yaml,
+                    csv_path,
+                    directory / "legacy.yml",
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Command line interface for the data tools.
+
+Usage: python -m src [--timings] {scrape,backfill,sort,merge,apply,update-masterdata,rollover,ics,bundle,convert} [options]
+
+Tools are imported only when their command runs, so commands that do not scrape do not load the network
+stack.
+"""
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import List
+
+from src.config import feeds
+
+
+def scrape(module: ModuleType, args):
+    module.scrape_update_suggestions_from_wikicfp(
+        full=args.full, refresh_rankings=args.refresh_rankings, restart=args.restart
+    )
+
+
+def backfill(module: ModuleType, args):
+    kwargs = {"output_path": args.output} if args.output else {}
+    module.backfill_from_archive(args.archive_dir, workers=args.workers, **kwargs)
+
+
+def sort(module: ModuleType, args):
+    from src.config import yaml_path_conferences
+
+    module.sort_data(args.path or yaml_path_conferences, overwrite=not args.keep)
+
+
+def merge(module: ModuleType, args):
+    module.merge_feeds(args.feed or None)
+
+
+def apply(module: ModuleType, args):
+    module.main()
+
+
+def update_masterdata(module: ModuleType, args):
+    module.update_master_data_from_conferences(full=args.full)
+
+
+def rollover(module: ModuleType, args):
+    rolled_over = module.save_conferences(module.load_conferences())
+    print(f"{rolled_over} conferences moved to the archive")
+
+
+def ics(module: ModuleType, args):
+    module.main()
+
+
+def bundle(module: ModuleType, args):
+    module.main()
+
+
+def convert(module: ModuleType, args):
+    from src.config import yaml_path_conferences
+
+    if args.direction == "yaml2csv":
+        yaml_path = args.input or yaml_path_conferences
+        module.convert_yaml_to_csv(yaml_path, args.output or yaml_path.with_suffix(".csv"))
+    else:
+        csv_path = args.input or yaml_path_conferences.with_suffix(".csv")
+        module.convert_csv_to_yaml(csv_path, args.output or yaml_path_conferences)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src")
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print import and run time of the command to stderr",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scrape_parser = commands.add_parser(
+        "scrape", help="scrape WikiCFP for new and updated deadlines"
+    )
+    scrape_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="scrape all master data series, ignoring the scrape ledger",
+    )
+    scrape_parser.add_argument(
+        "--refresh-rankings",
+        action="store_true",
+        help="rebuild the local CORE ranking index, e.g. after a new CORE edition",
+    )
+    scrape_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="discard the checkpoint of an interrupted run instead of resuming it",
+    )
+    scrape_parser.set_defaults(modules=["src.scraping.wikicfp_deadlines"], run=scrape)
+
+    backfill_parser = commands.add_parser(
+        "backfill",
+        help="build the deadline history of all series from archived WikiCFP pages, offline",
+    )
+    backfill_parser.add_argument(
+        "archive_dir", type=Path, help="directory with saved WikiCFP list and event pages"
+    )
+    backfill_parser.add_argument(
+        "--workers", type=int, help="number of parser processes, default: number of CPUs"
+    )
+    backfill_parser.add_argument(
+        "--output", type=Path, help="default: conference_backfill_candidates.yml"
+    )
+    backfill_parser.set_defaults(modules=["src.scraping.wikicfp_backfill"], run=backfill)
+
+    sort_parser = commands.add_parser("sort", help="sort conferences by deadline")
+    sort_parser.add_argument(
+        "path", nargs="?", type=Path, help="yaml file, default: conferences.yml"
+    )
+    sort_parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="write to <name>_sorted.yml instead of overwriting the file",
+    )
+    sort_parser.set_defaults(modules=["src.tools.sort_data"], run=sort)
+
+    merge_parser = commands.add_parser(
+        "merge", help="merge the external deadline feeds into conferences.yml"
+    )
+    merge_parser.add_argument(
+        "--feed",
+        action="append",
+        choices=feeds,
+        help="merge only this feed (repeatable), default: all feeds in src/config.py",
+    )
+    merge_parser.set_defaults(modules=["src.tools.merge_feeds"], run=merge)
+
+    apply_parser = commands.add_parser(
+        "apply", help="add missing fields of the update candidates to conferences.yml"
+    )
+    apply_parser.set_defaults(modules=["src.tools.apply_update_candidates"], run=apply)
+
+    update_masterdata_parser = commands.add_parser(
+        "update-masterdata", help="add new conference series to the master data"
+    )
+    update_masterdata_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="also add series which only occur in the conference archive",
+    )
+    update_masterdata_parser.set_defaults(
+        modules=["src.tools.update_masterdata"], run=update_masterdata
+    )
+
+    rollover_parser = commands.add_parser(
+        "rollover", help="move passed conferences from conferences.yml into the yearly archive"
+    )
+    rollover_parser.set_defaults(modules=["src.io"], run=rollover)
+
+    ics_parser = commands.add_parser(
+        "ics", help="write the main, per sub and per ranking calendars"
+    )
+    ics_parser.set_defaults(modules=["src.ics"], run=ics)
+
+    bundle_parser = commands.add_parser(
+        "bundle", help="write the upcoming, per year and per sub json bundles for the website"
+    )
+    bundle_parser.set_defaults(modules=["src.bundles"], run=bundle)
+
+    convert_parser = commands.add_parser("convert", help="convert between yaml and csv")
+    convert_parser.add_argument("direction", choices=["yaml2csv", "csv2yaml"])
+    convert_parser.add_argument(
+        "--input", type=Path, help="default: conferences.yml / conferences.csv"
+    )
+    convert_parser.add_argument(
+        "--output", type=Path, help="default: conferences.csv / conferences.yml"
+    )
+    convert_parser.set_defaults(modules=["src.tools.yaml2csv"], run=convert)
+    return parser
+
+
+def main(argv: List[str] = None):
+    args = create_parser().parse_args(argv)
+    import_time = run_time = 0.0
+    for module_name in args.modules:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        import_time += time.perf_counter() - start
+        start = time.perf_counter()
+        args.run(module, args)
+        run_time += time.perf_counter() - start
+    if args.timings:
+        print(
+            f"{args.command}: import {import_time:.3f} s, run {run_time:.3f} s",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
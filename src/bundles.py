@@ -0,0 +1,122 @@
+import gzip
+import hashlib
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import (
+    bundle_dir,
+    bundle_hash_length,
+    json_path_bundle_manifest,
+    project_root,
+)
+from src.io import load_conferences
+
+
+# Keys of the search entries, what the search bar shows and links to
+search_keys = ["id", "title", "year", "sub"]
+
+
+def encode_bundle(data) -> bytes:
+    # dates are written like jsonify does in the templates, e.g. 2022-09-18
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode(
+        "utf-8"
+    )
+
+
+def compress_brotli(content: bytes) -> Optional[bytes]:
+    try:
+        import brotli  # optional dependency, .br files are skipped without it
+    except ImportError:
+        return None
+    return brotli.compress(content, quality=11)
+
+
+def write_file(path: Path, content: bytes):
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def write_bundle(name: str, data) -> List[Path]:
+    """
+    Writes <name>.<content hash>.json with its .gz and .br variants into bundle_dir, existing files are
+    not rewritten since the hash in the name covers their content.
+    Returns the paths of the bundle, the uncompressed file first.
+    """
+    content = encode_bundle(data)
+    content_hash = hashlib.sha256(content).hexdigest()[:bundle_hash_length]
+    path = bundle_dir / f"{name}.{content_hash}.json"
+    paths = [path, path.with_name(f"{path.name}.gz")]
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_file(paths[1], gzip.compress(content, compresslevel=9, mtime=0))
+        write_file(path, content)  # last, an existing json means its variants exist
+    br_path = path.with_name(f"{path.name}.br")
+    if br_path.exists():
+        paths.append(br_path)
+    else:
+        compressed = compress_brotli(content)
+        if compressed is not None:
+            write_file(br_path, compressed)
+            paths.append(br_path)
+    return paths
+
+
+def get_site_path(path: Path) -> str:
+    return "/" + path.relative_to(project_root).as_posix()
+
+
+def build_bundles(conferences: List[Dict]) -> Dict:
+    """
+    Writes the search entries of all conferences (loaded by the search bar of every page) and one shard per
+    year with all its conferences (loaded on demand for the archived years on the index page), stale bundles
+    are removed.
+    Returns the manifest, the site paths of the bundles by logical name.
+    """
+    years: Dict[str, List[Dict]] = defaultdict(list)
+    for conf_data in conferences:
+        years[str(conf_data["year"])].append(conf_data)
+
+    written = write_bundle(
+        "search",
+        [{key: conf_data.get(key) for key in search_keys} for conf_data in conferences],
+    )
+    manifest = {"search": get_site_path(written[0]), "year": {}}
+    for year, year_conferences in sorted(years.items()):
+        paths = write_bundle(f"year/{year}", year_conferences)
+        manifest["year"][year] = get_site_path(paths[0])
+        written.extend(paths)
+
+    for path in bundle_dir.glob("**/*.json*"):
+        if path not in written:
+            path.unlink()
+    return manifest
+
+
+def save_manifest(manifest: Dict) -> bool:
+    content = (json.dumps(manifest, indent=2) + "\n").encode("utf-8")
+    try:
+        with open(json_path_bundle_manifest, "rb") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    write_file(json_path_bundle_manifest, content)
+    return True
+
+
+def main():
+    manifest = build_bundles(load_conferences(full=True))
+    save_manifest(manifest)
+    print(
+        f"{1 + len(manifest['year'])} bundles in {bundle_dir}, "
+        f"manifest {json_path_bundle_manifest}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,113 @@
+import os
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
+# Data files and local state, both can be moved, e.g. for load tests against python -m benchmarks.mock_server
+data_dir = Path(os.environ.get("DEADLINES_DATA_DIR", project_root / "_data"))
+cache_dir = Path(os.environ.get("DEADLINES_CACHE_DIR", project_root / ".cache"))
 
-csv_path_master_data = project_root / "_data/master_data.csv"
-yaml_path_conferences = project_root / "_data/conferences.yml"
-yaml_path_conference_new_candidates = (
-    project_root / "_data/conference_new_candidates.yml"
-)
-yaml_path_conference_updated_candidates = (
-    project_root / "_data/conference_update_candidates.yml"
-)
+csv_path_master_data = data_dir / "master_data.csv"
+# Hot partition: entries with a TBA deadline, a deadline passed less than hot_retention_days ago or a conference
+# that has not ended. Older entries roll over into one archive file per year when conferences.yml is saved.
+yaml_path_conferences = data_dir / "conferences.yml"
+conference_archive_dir = data_dir / "conferences_archive"
+hot_retention_days = 90
+yaml_path_conference_new_candidates = data_dir / "conference_new_candidates.yml"
+yaml_path_conference_updated_candidates = data_dir / "conference_update_candidates.yml"
+# Deadlines of all years found by python -m src backfill in archived WikiCFP pages
+yaml_path_conference_backfill = data_dir / "conference_backfill_candidates.yml"
+
+# Base urls of the scraped sites
+wikicfp_base_url = os.environ.get("DEADLINES_WIKICFP_URL", "http://wikicfp.com").rstrip("/")
+core_base_url = os.environ.get("DEADLINES_CORE_URL", "http://portal.core.edu.au").rstrip("/")
+
+# Minimum seconds between two requests to the same host, see http://wikicfp.com/cfp/data.jsp. Keyed by base url,
+# requests to its host and port share the interval, with or without www.
+request_interval = float(os.environ.get("DEADLINES_REQUEST_INTERVAL", 5))
+request_intervals = {
+    wikicfp_base_url: request_interval,
+    core_base_url: request_interval,
+}
+scrape_workers = int(os.environ.get("DEADLINES_SCRAPE_WORKERS", 4))
+
+http_cache_dir = cache_dir / "http"
+http_cache_max_bytes = 200 * 1024 ** 2
+# Seconds a cached response is used without revalidation, matched by url prefix
+http_cache_ttls = {
+    f"{wikicfp_base_url}/cfp/servlet/tool.search": 12 * 3600,
+    f"{wikicfp_base_url}/cfp/servlet/event.showcfp": 24 * 3600,
+    core_base_url: 30 * 24 * 3600,
+    "https://raw.githubusercontent.com": 3600,
+}
+http_cache_default_ttl = 24 * 3600
+# Only replay cached responses, never use the network
+http_cache_offline = os.environ.get("DEADLINES_OFFLINE", "") not in ["", "0"]
+
+json_path_scrape_ledger = cache_dir / "scrape_ledger.json"
+# Seconds until a series is scraped again
+rescrape_interval = 20 * 3600
+# Seconds until a series with a known upcoming deadline in conferences.yml is scraped again
+rescrape_interval_confirmed = 7 * 24 * 3600
+
+core_rankings_dir = cache_dir / "core_rankings"
+
+# HTML parser for scraped pages: "strainer" (only the target subtree), "lxml" or "soup" (full page)
+html_parser_backend = os.environ.get("DEADLINES_HTML_PARSER", "strainer")
+
+http_connect_timeout = 10
+http_read_timeout = 30
+http_max_retries = 3
+# Seconds, the n-th retry waits a random time up to http_backoff_factor * 2 ** n
+http_backoff_factor = 1.0
+http_backoff_max = 60
+
+json_path_scrape_checkpoint = cache_dir / "scrape_checkpoint.json"
+
+# Run report of the last scrape: seconds per stage, events and HTTP metrics per host
+json_path_scrape_report = cache_dir / "scrape_report.json"
+# The report is also written in the Prometheus text format to this path if set, e.g. in the directory of the
+# textfile collector of the node exporter
+prometheus_textfile_path = os.environ.get("DEADLINES_PROMETHEUS_TEXTFILE") or None
+
+# Parsed yaml files are kept as pickle snapshots, validated by size, mtime and content hash
+yaml_snapshot_dir = cache_dir / "yaml"
+
+# External conferences.yml feeds merged into conferences.yml, in this order. Rules per feed (all optional):
+# - rename_keys: old -> new key
+# - replace: key -> {old substring: new substring} for string values
+# - derive_id: id is the lowercase title and the last two digits of the year
+# - skip_titles: records whose title contains one of these (case insensitive) are ignored
+# - require_master_data: new series are only added if the title is in the master data, with its full_name
+# - drop_keys, drop_values: keys removed from merged records, keys with one of these values are removed
+# Keys which are no fields of ConferenceDeadline are removed after renaming, the tools load records as models.
+feeds = {
+    "pwc": {
+        "url": "https://raw.githubusercontent.com/paperswithcode/ai-deadlines/gh-pages/_data/conferences.yml",
+        "rename_keys": {"long": "full_name"},
+        "require_master_data": True,
+    },
+    "ad": {
+        "url": "https://raw.githubusercontent.com/daniel-bogdoll/ad-deadlines/gh-pages/_data/conferences.yml",
+        "rename_keys": {"long": "full_name"},
+        "replace": {"sub": {"V2X": "AD", "IV": "AD", "AS": "AD"}, "title": {"/": "-"}},
+        "derive_id": True,
+        "skip_titles": ["(ws)", "(deadline estimated)"],
+        "drop_keys": ["host"],
+        "drop_values": ["--"],
+    },
+}
+feed_state_dir = cache_dir / "feeds"
+
+# Calendars written by python -m src ics and published by Jekyll as static files: the main calendar
+# ai-deadlines.ics (linked on the index page) and one per sub and per ranking in calendar_dir
+calendar_dir = project_root / "calendars"
+ics_path_main_calendar = project_root / "ai-deadlines.ics"
+site_domain = "deadlines.info"
+# Deadlines older than this are left out of the calendars
+ics_history_days = 365
+
+# Data bundles written by python -m src bundle: content hashed json files (with .gz and, if brotli is
+# installed, .br next to them) in bundle_dir, the current file names are listed in json_path_bundle_manifest
+bundle_dir = project_root / "static/data"
+json_path_bundle_manifest = data_dir / "bundles.json"
+bundle_hash_length = 10
@@ -0,0 +1,277 @@
+import copy
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import dateutil.parser
+import yaml
+
+from src.config import (
+    csv_path_master_data,
+    feed_state_dir,
+    feeds as feed_configs,
+)
+from src.io import YamlLoader, load_conferences, load_csv, save_conferences
+from src.scraping.models import ConferenceDeadline
+from src.scraping.scheduler import fetch_page, map_concurrently
+from src.scraping.utils import get_date_format_from_start_and_end
+from src.store import ConferenceStore
+
+time_format = "%Y-%m-%d %H:%M"
+tba_words = ["tba", "tbd"]
+
+
+@dataclass
+class Feed:
+    """
+    External conferences.yml merged into conferences.yml, the rules are described at feeds in src/config.py
+    """
+
+    name: str
+    url: str
+    rename_keys: Dict[str, str] = field(default_factory=dict)
+    replace: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    derive_id: bool = False
+    skip_titles: List[str] = field(default_factory=list)
+    require_master_data: bool = False
+    drop_keys: List[str] = field(default_factory=list)
+    drop_values: List[str] = field(default_factory=list)
+
+    def transform(self, record: Dict) -> Optional[Dict]:
+        """
+        Applies the rules of the feed to a copy of record, None if the record is skipped. Only the fields of
+        ConferenceDeadline are kept.
+        """
+        record = copy.deepcopy(record)
+        for key, replacements in self.replace.items():
+            if isinstance(record.get(key), str):
+                for old, new in replacements.items():
+                    record[key] = record[key].replace(old, new)
+        if self.derive_id:
+            record["id"] = record["title"].lower() + str(record["year"])[2:]
+        title = str(record.get("title", "")).lower()
+        if any(word in title for word in self.skip_titles):
+            return None
+        for old, new in self.rename_keys.items():
+            if old in record:
+                record[new] = record.pop(old)
+        return {
+            key: val for key, val in record.items() if key in ConferenceDeadline.__slots__
+        }
+
+
+def get_feeds(names: Iterable[str] = None) -> List[Feed]:
+    names = list(feed_configs) if names is None else names
+    return [Feed(name=name, **feed_configs[name]) for name in names]
+
+
+def compute_record_hash(record: Dict) -> str:
+    content = json.dumps(record, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class FeedState:
+    """
+    Hash of the feed body, of the master data (for feeds with require_master_data) and hashes of the records
+    of a feed as they were merged last time, keyed by id
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries: Dict = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+        self.record_hashes: Dict[str, str] = self.entries.setdefault("records", {})
+
+    @classmethod
+    def for_feed(cls, feed: Feed) -> "FeedState":
+        return cls(feed_state_dir / f"{feed.name}.json")
+
+    @property
+    def body_hash(self) -> Optional[str]:
+        return self.entries.get("body_hash")
+
+    @body_hash.setter
+    def body_hash(self, value: str):
+        self.entries["body_hash"] = value
+
+    @property
+    def master_data_hash(self) -> Optional[str]:
+        return self.entries.get("master_data_hash")
+
+    @master_data_hash.setter
+    def master_data_hash(self, value: Optional[str]):
+        self.entries["master_data_hash"] = value
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class FeedDelta:
+    """
+    Records of a feed added or changed since the last merge (with their hash) and ids of removed records
+    """
+
+    feed: Feed
+    state: FeedState
+    body_hash: str
+    master_data_hash: Optional[str] = None
+    added: List[Tuple[Dict, str]] = field(default_factory=list)
+    changed: List[Tuple[Dict, str]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    @property
+    def modified(self) -> bool:
+        return (
+            self.body_hash != self.state.body_hash
+            or self.master_data_hash != self.state.master_data_hash
+        )
+
+    def mark_merged(self):
+        self.state.body_hash = self.body_hash
+        self.state.master_data_hash = self.master_data_hash
+
+
+def compute_file_hash(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def load_feed_delta(feed: Feed) -> FeedDelta:
+    """
+    Fetches the feed with a conditional request. The body is only parsed if its hash (or, for feeds with
+    require_master_data, the hash of the master data) differs from the last merge, then all transformed
+    records are compared with the hashes of the last merge. Records skipped for missing master data have no
+    hash, so they are added once their series is in the master data.
+    """
+    state = FeedState.for_feed(feed)
+    body = fetch_page(feed.url, refresh=True)
+    master_data_hash = (
+        compute_file_hash(csv_path_master_data) if feed.require_master_data else None
+    )
+    delta = FeedDelta(feed, state, hashlib.sha256(body).hexdigest(), master_data_hash)
+    if not delta.modified:
+        return delta
+    ids = set()
+    for record in yaml.load(body, Loader=YamlLoader) or []:
+        conf_data = feed.transform(record)
+        if conf_data is None:
+            continue
+        ids.add(conf_data["id"])
+        record_hash = compute_record_hash(conf_data)
+        previous_hash = state.record_hashes.get(conf_data["id"])
+        if previous_hash is None:
+            delta.added.append((conf_data, record_hash))
+        elif previous_hash != record_hash:
+            delta.changed.append((conf_data, record_hash))
+    delta.removed = [conf_id for conf_id in state.record_hashes if conf_id not in ids]
+    return delta
+
+
+def normalize_record(feed: Feed, conf_data: Dict):
+    delete_keys = feed.drop_keys + [
+        key
+        for key, val in conf_data.items()
+        if isinstance(val, str) and val in feed.drop_values
+    ]
+    for key in delete_keys:
+        conf_data.pop(key, None)
+    for key, val in conf_data.items():
+        if key == "note" and val is not None:
+            conf_data[key] = val.replace("<b>NOTE</b>: ", "")
+        if key == "date":
+            if (
+                conf_data.get("start", None) is not None
+                and conf_data.get("end", None) is not None
+            ):
+                start = conf_data["start"]
+                end = conf_data["end"]
+                if isinstance(start, str):
+                    start = dateutil.parser.parse(start)
+                if isinstance(end, str):
+                    end = dateutil.parser.parse(end)
+                conf_data[key] = get_date_format_from_start_and_end(start, end)
+        if "deadline" in key and isinstance(val, str) and val.lower() not in tba_words:
+            date = dateutil.parser.parse(val)
+            conf_data[key] = date.strftime(time_format)
+
+
+def merge_feed(
+    delta: FeedDelta, conferences: ConferenceStore, master_data: Dict[str, Dict]
+) -> Tuple[int, int]:
+    """
+    Merges the added and changed records of a feed into conferences, values of the feed replace differing
+    local values. Records removed from the feed are kept in conferences.
+    Returns the number of added and updated records.
+    """
+    feed, state = delta.feed, delta.state
+    added = updated = 0
+    for conf_data, record_hash in delta.added + delta.changed:
+        conf_id = conf_data["id"]
+        conf_match = conferences.get_lower(conf_id)
+        if conf_match is None:  # conf does not exist
+            if feed.require_master_data:
+                master_data_match = master_data.get(str(conf_data["title"]).lower())
+                if master_data_match is None:
+                    continue  # not recorded, the series may be added to the master data later
+                conf_data["full_name"] = master_data_match["full_name"]
+            normalize_record(feed, conf_data)
+            conferences.add(conf_data)
+            added += 1
+        else:  # conf exists -> overwrite data if mismatch
+            changed = False
+            for key, val in conf_data.items():
+                if val != conf_match.get(key, None):
+                    conf_match[key] = val
+                    changed = True
+            normalize_record(feed, conf_match)
+            updated += changed
+        state.record_hashes[conf_id] = record_hash
+    for conf_id in delta.removed:
+        del state.record_hashes[conf_id]
+    delta.mark_merged()
+    return added, updated
+
+
+def merge_feeds(names: Iterable[str] = None):
+    """
+    Fetches the feeds concurrently and merges their changes into conferences.yml in the configured order.
+    conferences.yml is neither read nor written if no feed has new, changed or removed records. The feeds are
+    merged into the hot and the archived conferences, so a record of an archived conference updates the
+    archived record (keeping its local keys, e.g. ranking) instead of replacing it.
+    """
+    changed_deltas = []
+    for delta in map_concurrently(load_feed_delta, get_feeds(names)):
+        if delta.modified:
+            changed_deltas.append(delta)
+        else:
+            print(f"{delta.feed.name}: not modified")
+    if all(delta.empty for delta in changed_deltas):
+        for delta in changed_deltas:
+            delta.mark_merged()
+            delta.state.save()
+        return
+    conferences = ConferenceStore(load_conferences(full=True))
+    master_data = {c["title"].lower(): c for c in load_csv(csv_path_master_data)}
+    for delta in changed_deltas:
+        added, updated = merge_feed(delta, conferences, master_data)
+        print(
+            f"{delta.feed.name}: {len(delta.added)} new and {len(delta.changed)} changed records, "
+            f"{added} added, {updated} updated, {len(delta.removed)} removed from the feed"
+        )
+    save_conferences(conferences.values())
+    for delta in changed_deltas:  # only after the merged data is saved
+        delta.state.save()
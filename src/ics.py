@@ -0,0 +1,209 @@
+import datetime
+import hashlib
+import os
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.config import (
+    calendar_dir,
+    ics_history_days,
+    ics_path_main_calendar,
+    site_domain,
+)
+from src.io import load_conferences
+from src.scraping.dates import get_utc_timestamp
+from src.scraping.models import ConferenceDeadline
+from src.store import get_subs
+
+ics_datetime_format = "%Y%m%dT%H%M%S"
+ranking_file_names = {"As": "a-star", "A": "a", "B": "b", "C": "c"}
+ranking_names = {"As": "A*", "A": "A", "B": "B", "C": "C"}
+
+# (uid, unfolded lines of the event without DTSTAMP)
+Event = Tuple[str, List[str]]
+
+
+def escape_text(text) -> str:
+    return (
+        str(text)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """
+    Continues lines longer than 75 octets on the next line after a space, see RFC 5545 3.1
+    """
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts, current = [], ""
+    for char in line:
+        if len((current + char).encode("utf-8")) > (74 if parts else 75):
+            parts.append(current)
+            current = ""
+        current += char
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def unfold_lines(text: str) -> List[str]:
+    """
+    Lines of a calendar with continuation lines joined, the inverse of fold_line
+    """
+    return re.sub(r"\r\n[ \t]", "", text).split("\r\n")
+
+
+def format_start(value: datetime.datetime, timezone: str) -> str:
+    """
+    Start in UTC, the calendars have no VTIMEZONE components which a TZID would have to refer to
+    """
+    utc = datetime.datetime.fromtimestamp(
+        get_utc_timestamp(value, timezone), datetime.timezone.utc
+    )
+    return f"DTSTART:{utc.strftime(ics_datetime_format)}Z"
+
+
+def get_events(conference: ConferenceDeadline, min_timestamp: float) -> List[Event]:
+    events = []
+    for key, uid, label in [
+        ("abstract_deadline", f"{conference.id}-abstract", "abstract deadline"),
+        ("deadline", conference.id, "deadline"),
+    ]:
+        value = getattr(conference, key)
+        if not isinstance(value, datetime.datetime):  # missing or TBA
+            continue
+        if get_utc_timestamp(value, conference.timezone) < min_timestamp:
+            continue
+        lines = [
+            "BEGIN:VEVENT",
+            f"SUMMARY:{escape_text(f'{conference.title} {conference.year} {label}')}",
+            f"UID:{escape_text(uid)}",
+            "ORGANIZER:aideadlin.es",
+            format_start(value, conference.timezone),
+            "END:VEVENT",
+        ]
+        events.append((uid, lines))
+    return events
+
+
+def compute_event_hash(lines: List[str]) -> str:
+    content = "\r\n".join(l for l in lines if not l.startswith("DTSTAMP:"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def read_events(path: Path) -> Optional[Dict[str, Tuple[str, str]]]:
+    """
+    uid -> (hash, DTSTAMP line) of the events in an existing calendar, None if path is no calendar
+    """
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return None
+    if not text.startswith("BEGIN:VCALENDAR"):
+        return None
+    events, lines = {}, []
+    for line in unfold_lines(text):
+        if line == "BEGIN:VEVENT":
+            lines = []
+        lines.append(line)
+        if line == "END:VEVENT":
+            uid = next((l[4:] for l in lines if l.startswith("UID:")), None)
+            dtstamp = next((l for l in lines if l.startswith("DTSTAMP:")), None)
+            if uid is not None and dtstamp is not None:
+                events[uid] = (compute_event_hash(lines), dtstamp)
+    return events
+
+
+def write_calendar(path: Path, name: str, events: List[Event], now: float) -> bool:
+    """
+    Writes the calendar if the hashes of its events differ from the existing file.
+    Unchanged events keep their DTSTAMP, so clients do not see them as modified.
+    Returns True if the file was written.
+    """
+    existing = read_events(path)
+    dtstamp = f"DTSTAMP:{time.strftime(ics_datetime_format, time.gmtime(now))}Z"
+    hashes = [compute_event_hash(lines) for _, lines in events]
+    if existing is None:
+        existing = {}
+    elif list(existing) == [uid for uid, _ in events] and all(
+        existing[uid][0] == event_hash for (uid, _), event_hash in zip(events, hashes)
+    ):
+        return False
+    lines = [
+        "BEGIN:VCALENDAR",
+        "METHOD:PUBLISH",
+        "VERSION:2.0",
+        f"PRODID:-//{site_domain}//ai-deadlines//EN",
+        fold_line(f"X-WR-CALNAME:{escape_text(name)}"),
+        "X-PUBLISHED-TTL:PT1H",
+    ]
+    for (uid, event_lines), event_hash in zip(events, hashes):
+        previous_hash, previous_dtstamp = existing.get(uid, (None, None))
+        event_dtstamp = previous_dtstamp if previous_hash == event_hash else dtstamp
+        lines.extend(
+            fold_line(line)
+            for line in event_lines[:-2] + [event_dtstamp] + event_lines[-2:]
+        )
+    lines.append("END:VCALENDAR")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.write("\r\n".join(lines) + "\r\n")
+    os.replace(tmp_path, path)
+    return True
+
+
+def export_calendars(conferences: List[ConferenceDeadline], now: float = None) -> List[Path]:
+    """
+    Writes the main calendar and one calendar per sub and per ranking, stale calendars are removed.
+    Returns the paths of the written calendars.
+    """
+    now = time.time() if now is None else now
+    min_timestamp = now - ics_history_days * 24 * 3600
+    names = {ics_path_main_calendar: "AI conference deadlines"}
+    calendars: Dict[Path, List[Event]] = defaultdict(list)
+    calendars[ics_path_main_calendar] = []
+    for conference in conferences:
+        events = get_events(conference, min_timestamp)
+        if len(events) == 0:
+            continue
+        paths = [ics_path_main_calendar]
+        for sub in get_subs(conference):
+            path = calendar_dir / "sub" / f"{sub.lower()}.ics"
+            names[path] = f"{sub} conference deadlines"
+            paths.append(path)
+        if conference.ranking in ranking_file_names:
+            path = calendar_dir / "ranking" / f"{ranking_file_names[conference.ranking]}.ics"
+            names[path] = f"CORE {ranking_names[conference.ranking]} conference deadlines"
+            paths.append(path)
+        for path in paths:
+            calendars[path].extend(events)
+
+    written = [
+        path
+        for path, events in calendars.items()
+        if write_calendar(path, names[path], events, now)
+    ]
+    for path in calendar_dir.glob("*/*.ics"):
+        if path not in calendars:
+            path.unlink()
+    return written
+
+
+def main():
+    conferences = [
+        ConferenceDeadline.from_dict(data) for data in load_conferences(full=True)
+    ]
+    written = export_calendars(conferences)
+    print(f"{len(written)} calendars written")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,35 @@
 import csv
-import datetime
+import hashlib
+import io
+import math
+import os
+import pickle
+import time
+from collections import defaultdict, deque
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-import requests
 import yaml
 
+from src.config import (
+    conference_archive_dir,
+    hot_retention_days,
+    yaml_path_conferences,
+    yaml_snapshot_dir,
+)
+from src.scraping.dates import get_record_timestamp
 from src.scraping.models import ConferenceDeadline
 
+try:  # libyaml bindings
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as FastYamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
-def load_ai_deadlines_data(site="pwc"):
-    url = {
-        "pwc": "https://raw.githubusercontent.com/paperswithcode/ai-deadlines/gh-pages/_data/conferences.yml",
-        "ad": "https://raw.githubusercontent.com/daniel-bogdoll/ad-deadlines/gh-pages/_data/conferences.yml",
-    }[site]
-    r = requests.get(url)
-    conferences = yaml.safe_load(r.content)
-    conferences = {conf["id"]: conf for conf in conferences}
-    return conferences
+    FastYamlDumper = None
+
+# A file modified this close to the time its snapshot was written may have changed again without a new
+# mtime (coarse file system timestamps), such snapshots are always validated by content hash
+snapshot_mtime_granularity = 2
 
 
 def load_csv(path, key=None):
@@ -31,10 +43,10 @@ def load_csv(path, key=None):
 
 def save_csv(path, data, key_order=None):
     key_order = (
-        list(set(sum([list(d.keys()) for d in data], [])))
+        list(dict.fromkeys(key for d in data for key in d))
         if key_order is None
         else key_order
-    )  # get all keys
+    )  # get all keys in order of appearance
     with open(path, "w", newline="", encoding="utf-8") as file:
         dict_writer = csv.DictWriter(file, key_order)
         dict_writer.writeheader()
@@ -42,23 +54,310 @@ def save_csv(path, data, key_order=None):
 
 
 def load_yaml(path, key=None):
-    with open(path, encoding="utf-8") as f:
-        data = yaml.load(f, Loader=yaml.SafeLoader)
+    path = Path(path)
+    stat = path.stat()
+    snapshot = read_yaml_snapshot(path)
+    if (
+        snapshot is not None
+        and snapshot["size"] == stat.st_size
+        and snapshot["mtime_ns"] == stat.st_mtime_ns
+        and stat.st_mtime < snapshot["written_at"] - snapshot_mtime_granularity
+    ):
+        data = snapshot["data"]
+    else:
+        content = path.read_bytes()
+        content_hash = hashlib.sha256(content).hexdigest()
+        if snapshot is not None and snapshot["sha256"] == content_hash:
+            data = snapshot["data"]
+        else:
+            data = yaml.load(content, Loader=YamlLoader)
+        # (re)stamp the snapshot so the next load can skip reading the file
+        write_yaml_snapshot(path, (stat.st_size, stat.st_mtime_ns, content_hash), data)
     if key:
         data = {l[key]: l for l in data}
     return data
 
 
+def get_yaml_snapshot_path(path: Path) -> Path:
+    path_hash = hashlib.sha256(str(Path(path).resolve()).encode("utf-8")).hexdigest()
+    return yaml_snapshot_dir / f"{path_hash}.pickle"
+
+
+def read_yaml_snapshot(path: Path) -> Optional[dict]:
+    try:
+        with open(get_yaml_snapshot_path(path), "rb") as f:
+            return pickle.load(f)
+    except Exception:  # missing or unreadable snapshots are rebuilt
+        return None
+
+
+def write_yaml_snapshot(path: Path, stamp: Tuple[int, int, str], data):
+    """
+    :param stamp: size, mtime in ns and sha256 of the yaml file data was parsed from
+    """
+    size, mtime_ns, content_hash = stamp
+    snapshot_path = get_yaml_snapshot_path(path)
+    tmp_path = snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+    snapshot = {
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "sha256": content_hash,
+        "written_at": time.time(),
+        "data": data,
+    }
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
+    except OSError as e:  # the snapshot is only a cache
+        print(f"Warning: could not write yaml snapshot for {path}: {e}")
+
+
+def can_use_fast_dumper(data) -> bool:
+    """
+    libyaml folds and escapes some scalars differently than the python emitter (non printable or non ascii
+    characters, empty or long mapping keys). It is only used for data without such scalars, so the output
+    is the same with and without libyaml.
+    """
+    if isinstance(data, str):
+        return data.isascii() and data.isprintable()
+    if isinstance(data, dict):
+        return all(
+            (not isinstance(k, str) or 0 < len(k) <= 64)
+            and can_use_fast_dumper(k)
+            and can_use_fast_dumper(v)
+            for k, v in data.items()
+        )
+    if isinstance(data, (list, tuple)):
+        return all(can_use_fast_dumper(d) for d in data)
+    return True
+
+
+def dump_yaml(data, stream):
+    dumper = (
+        FastYamlDumper
+        if FastYamlDumper is not None and can_use_fast_dumper(data)
+        else yaml.SafeDumper
+    )
+    yaml.dump(data, stream, Dumper=dumper, sort_keys=False)
+
+
 def save_yaml(path, data):
-    with open(path, "w", encoding="utf-8") as file:
-        yaml.safe_dump(data, file, sort_keys=False)
+    """
+    Writes data to path with an atomic rename. If data is a list of records and path already holds one,
+    only new or changed records are serialized, the text of all other records is copied from the
+    existing file. The snapshot of path is written from data, so the next load or save does not parse
+    the file.
+    """
+    path = Path(path)
+    if isinstance(data, list) and path.exists():
+        text = render_yaml_records(path, data)
+    else:
+        text = None
+    if text is None:
+        stream = io.StringIO()
+        dump_yaml(data, stream)
+        text = stream.getvalue()
+    elif text == read_text(path):
+        return
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    content = text.encode("utf-8")
+    with open(tmp_path, "wb") as file:
+        file.write(content)
+    os.replace(tmp_path, path)
+    stat = path.stat()
+    write_yaml_snapshot(
+        path, (stat.st_size, stat.st_mtime_ns, hashlib.sha256(content).hexdigest()), data
+    )
+
+
+def read_text(path: Path) -> str:
+    with open(path, encoding="utf-8", newline="") as file:
+        return file.read()
+
+
+def is_yaml_record_start(line: str) -> bool:
+    return line.startswith("- ") or line.rstrip("\r\n") == "-"
+
+
+def iter_yaml_records(path, batch_size=1000) -> Iterator:
+    """
+    Yields the items of the yaml list in path one by one, parsing the text of batch_size top level items
+    at a time. Memory use is bounded by the batch instead of the file size.
+    """
+    with open(path, encoding="utf-8") as file:
+        lines, records = [], 0
+        for line in file:
+            if is_yaml_record_start(line):
+                if records == batch_size:
+                    yield from yaml.load("".join(lines), Loader=YamlLoader)
+                    lines, records = [], 0
+                records += 1
+            lines.append(line)
+        data = yaml.load("".join(lines), Loader=YamlLoader)
+    yield from data or []
+
+
+def split_yaml_records(text: str) -> Tuple[str, List[str]]:
+    """
+    Splits the text of a top level block sequence into the text before the first item and the text of
+    each item, including the comments following it
+    """
+    header, records = [], []
+    for line in text.splitlines(keepends=True):
+        if is_yaml_record_start(line):
+            records.append([line])
+        elif len(records) == 0:
+            header.append(line)
+        else:
+            records[-1].append(line)
+    return "".join(header), ["".join(r) for r in records]
+
+
+def is_same_yaml_data(a, b) -> bool:
+    """
+    True if a and b are dumped to the same yaml, unlike == this considers key order and bool vs int
+    """
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return len(a) == len(b) and all(
+            k_a == k_b and is_same_yaml_data(v_a, v_b)
+            for (k_a, v_a), (k_b, v_b) in zip(a.items(), b.items())
+        )
+    if isinstance(a, list):
+        return len(a) == len(b) and all(is_same_yaml_data(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def render_yaml_records(path: Path, records: List, key="id") -> Optional[str]:
+    """
+    Text of the yaml list records, reusing the text of unchanged records (matched by key) in path.
+    Returns None if the records in path can not be told apart, e.g. because it is written in flow style.
+    """
+    try:
+        old_records = load_yaml(path)
+    except yaml.YAMLError:
+        return None
+    header, old_texts = split_yaml_records(read_text(path))
+    if (
+        len(records) == 0
+        or not isinstance(old_records, list)
+        or len(old_texts) == 0
+        or len(old_records) != len(old_texts)
+        or not all(
+            isinstance(r, dict) and (len(r) == 0 or str(next(iter(r))) in t.split("\n")[0])
+            for r, t in zip(old_records, old_texts)
+        )
+    ):
+        return None
+
+    old_by_key = defaultdict(deque)
+    for record, text in zip(old_records, old_texts):
+        old_by_key[record.get(key)].append((record, text))
+    texts = [header]
+    for record in records:
+        candidates = old_by_key.get(record.get(key)) if isinstance(record, dict) else None
+        if candidates and is_same_yaml_data(candidates[0][0], record):
+            texts.append(candidates.popleft()[1])
+        else:
+            stream = io.StringIO()
+            dump_yaml([record], stream)
+            texts.append(stream.getvalue())
+    return "".join(texts)
+
+
+def append_yaml(path, data):
+    """
+    Appends the items of data to the yaml list in path
+    """
+    empty = not Path(path).exists() or Path(path).stat().st_size <= len("[]\n")
+    with open(path, "w" if empty else "a", encoding="utf-8") as file:
+        dump_yaml(data, file)
 
 
 def save_updated_data(conference_deadlines: List[ConferenceDeadline], path: Path):
     conference_deadlines = sorted(
         conference_deadlines,
-        key=lambda x: x.deadline
-        if x.deadline is not None
-        else datetime.datetime(3000, 1, 1),
+        key=lambda x: x.deadline_utc if x.deadline is not None else math.inf,
     )
-    save_yaml(path, [c.as_dict() for c in conference_deadlines])
+    data = [c.as_dict() for c in conference_deadlines]
+    if Path(path) == yaml_path_conferences:  # the hot partition, passed entries are rolled over
+        save_conferences(data)
+    else:
+        save_yaml(path, data)
+
+
+def get_conference_archive_path(year) -> Path:
+    return conference_archive_dir / f"{year}.yml"
+
+
+def get_conference_archive_paths() -> List[Path]:
+    # newest year first, like the descending deadlines in conferences.yml
+    return sorted(conference_archive_dir.glob("*.yml"), key=lambda p: p.stem, reverse=True)
+
+
+def load_conferences(full=False, key=None):
+    """
+    Records of the hot partition conferences.yml. With full=True the records of the archive follow, newest
+    year first, a record in several partitions is only taken from the hot one or the newest archive file.
+    """
+    data = load_yaml(yaml_path_conferences)
+    if full:
+        data = list(data)
+        ids = {conf["id"] for conf in data}
+        for path in get_conference_archive_paths():
+            for conf in load_yaml(path):
+                if conf["id"] not in ids:
+                    ids.add(conf["id"])
+                    data.append(conf)
+    if key:
+        data = {l[key]: l for l in data}
+    return data
+
+
+def is_hot_conference(conf_data: Dict, now: float) -> bool:
+    """
+    Computed from the fields of the record, without a ConferenceDeadline, so unknown keys are kept and
+    no ranking is normalized
+    """
+    deadline = get_record_timestamp(conf_data, "deadline")
+    if deadline is None:  # missing or TBA
+        return True
+    if deadline >= now - hot_retention_days * 24 * 3600:
+        return True
+    end = get_record_timestamp(conf_data, "end")
+    end = get_record_timestamp(conf_data, "start") if end is None else end
+    return end is not None and end >= now
+
+
+def save_conferences(data: Iterable[Dict], now: float = None) -> int:
+    """
+    Writes the hot records of data to conferences.yml and moves the others into the archive file of their
+    year, replacing archived records with the same id. Records merged from elsewhere have to be merged into
+    load_conferences(full=True), otherwise they replace the archived record with its local keys.
+    The archive is written first, so an interrupted rollover leaves a record in both partitions instead of
+    losing it.
+    Returns the number of rolled over records.
+    """
+    now = time.time() if now is None else now
+    hot, cold = [], defaultdict(list)
+    for conf_data in data:
+        if is_hot_conference(conf_data, now):
+            hot.append(conf_data)
+        else:
+            cold[conf_data["year"]].append(conf_data)
+    for year, records in cold.items():
+        path = get_conference_archive_path(year)
+        archived = {c["id"]: c for c in (load_yaml(path) if path.exists() else [])}
+        archived.update((c["id"], c) for c in records)
+        archived = sorted(
+            archived.values(),
+            key=lambda c: get_record_timestamp(c, "deadline") or 0,
+            reverse=True,
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        save_yaml(path, archived)
+    save_yaml(yaml_path_conferences, hot)
+    return sum(len(records) for records in cold.values())
@@ -0,0 +1,181 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from src.config import (
+    http_cache_dir,
+    http_cache_max_bytes,
+    http_cache_ttls,
+    http_cache_default_ttl,
+    http_cache_offline,
+)
+from src.scraping.metrics import metrics
+
+# Seconds between two writes of the index for access times only, stored responses are written at once
+index_save_interval = 30
+
+# download(url, headers) -> (status, response headers, body)
+Download = Callable[[str, Dict[str, str]], Tuple[int, Dict[str, str], bytes]]
+
+
+class CacheMissError(Exception):
+    pass
+
+
+def get_ttl(url: str) -> float:
+    for prefix, ttl in http_cache_ttls.items():
+        if url.startswith(prefix):
+            return ttl
+    return http_cache_default_ttl
+
+
+class HttpCache:
+    """
+    On-disk response cache shared by all scrapers.
+
+    Bodies are stored content-addressed under bodies/<sha256>, index.json maps each url to its body hash,
+    ETag, Last-Modified, fetch time and ttl. Entries older than their ttl are revalidated with a conditional
+    request, the least recently used entries are evicted once the bodies exceed max_bytes.
+    In offline mode only cached responses are replayed. Access times of cache hits are written with the next
+    stored response, at most every index_save_interval seconds or by flush at exit.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, offline=False):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._index = None
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / "index.json"
+
+    def body_path(self, body_hash: str) -> Path:
+        return self.directory / "bodies" / body_hash
+
+    @property
+    def index(self) -> Dict[str, Dict]:
+        if self._index is None:
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def fetch(self, url: str, download: Download, refresh=False) -> bytes:
+        """
+        :param refresh: revalidate the cached response even if it is not expired
+        """
+        with self._lock:
+            entry = self.index.get(url)
+            body = self._read_body(entry) if entry is not None else None
+        if body is not None and (
+            self.offline
+            or (not refresh and time.time() - entry["fetched_at"] < entry["ttl"])
+        ):
+            with self._lock:
+                entry["last_access"] = time.time()
+                self._dirty = True
+                if time.monotonic() - self._saved_at > index_save_interval:
+                    self._save_index()
+            metrics.record_cache_hit(url)
+            return body
+        if self.offline:
+            raise CacheMissError(f"{url} is not cached (offline mode)")
+
+        headers = {}
+        if body is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        status, response_headers, new_body = download(url, headers)
+        if status == 304 and body is not None:
+            metrics.record_cache_hit(url, not_modified=True)
+            new_body = body
+        with self._lock:
+            self._store(url, new_body, response_headers)
+        return new_body
+
+    def _read_body(self, entry: Dict):
+        try:
+            return self.body_path(entry["hash"]).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _store(self, url: str, body: bytes, headers: Dict[str, str]):
+        headers = {k.lower(): v for k, v in headers.items()}
+        body_hash = hashlib.sha256(body).hexdigest()
+        body_path = self.body_path(body_hash)
+        if not body_path.exists():
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = body_path.with_suffix(".tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, body_path)
+        old_entry = self.index.get(url)
+        now = time.time()
+        self.index[url] = {
+            "hash": body_hash,
+            "size": len(body),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": now,
+            "last_access": now,
+            "ttl": get_ttl(url),
+        }
+        if old_entry is not None and old_entry["hash"] != body_hash:
+            self._unlink_unreferenced(old_entry["hash"])
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        references = Counter(e["hash"] for e in self.index.values())
+        sizes = {e["hash"]: e["size"] for e in self.index.values()}
+        total = sum(sizes.values())
+        by_access = sorted(self.index.items(), key=lambda x: x[1]["last_access"])
+        for url, entry in by_access[:-1]:  # always keep the newest entry
+            if total <= self.max_bytes:
+                break
+            del self.index[url]
+            references[entry["hash"]] -= 1
+            if references[entry["hash"]] == 0:  # body not used by other urls
+                total -= sizes[entry["hash"]]
+                self.body_path(entry["hash"]).unlink(missing_ok=True)
+
+    def _unlink_unreferenced(self, body_hash: str):
+        """
+        Removes the body of body_hash if no url refers to it anymore, e.g. after the response of its url changed
+        """
+        if all(e["hash"] != body_hash for e in self.index.values()):
+            self.body_path(body_hash).unlink(missing_ok=True)
+
+    def _save_index(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def flush(self):
+        """
+        Writes pending access times to the index
+        """
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+
+http_cache = HttpCache(http_cache_dir, http_cache_max_bytes, http_cache_offline)
+atexit.register(http_cache.flush)
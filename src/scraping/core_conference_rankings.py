@@ -1,19 +1,44 @@
-import urllib.request
-from typing import List
-
-from bs4 import BeautifulSoup
+import bisect
+import dataclasses
+import itertools
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
 
+from src.config import core_base_url, core_rankings_dir
 from src.scraping.models import ConferenceRanking, ConferenceDeadline
 from src.scraping.matching import compute_conference_ranking_match_score
+from src.scraping.parsing import parse_html
+from src.scraping.metrics import metrics
+from src.scraping.scheduler import fetch_page
+
+max_core_result_pages = 200
 
 
 def extract_conference_ranking_link(row):
     sub_url = row.get("onclick")[len("navigate('") : -3]
-    url = f"http://portal.core.edu.au{sub_url}"
+    url = f"{core_base_url}{sub_url}"
     return url
 
 
+def get_core_search_url(query: str, source: str, page: int = 1) -> str:
+    return f"{core_base_url}/conf-ranks/?search={query}&by=all&source={source}&sort=atitle&page={page}"
+
+
 def scrape_core_ratings(query: str, year: int) -> List[ConferenceRanking]:
+    url = get_core_search_url(query, f"CORE{year}")
+    try:
+        page = fetch_page(url)
+    except Exception as e:
+        print(f"Error: could not open {url}: {e}")
+        metrics.count("fetch_errors")
+        return []
+    return parse_core_ratings(page)
+
+
+def parse_core_ratings(page, backend=None) -> List[ConferenceRanking]:
     table_head = [
         "Title",
         "Acronym",
@@ -25,14 +50,7 @@ def scrape_core_ratings(query: str, year: int) -> List[ConferenceRanking]:
         "Comments",
         "Average Rating",
     ]
-    url = f"http://portal.core.edu.au/conf-ranks/?search={query}&by=all&source=CORE{year}&sort=atitle&page=1"
-
-    try:
-        page = urllib.request.urlopen(url)
-    except Exception as e:
-        print(f"Error: could not open {url}: {e}")
-        return []
-    soup = BeautifulSoup(page, "html.parser")
+    soup = parse_html(page, "div", {"id": "search"}, backend)
     tables = soup.select("div#search table")
     if len(tables) == 0:
         return []
@@ -58,9 +76,140 @@ def scrape_core_ratings(query: str, year: int) -> List[ConferenceRanking]:
     return rankings
 
 
+def normalize_ranking_key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class CoreRankingIndex:
+    """
+    All rankings of one CORE edition (e.g. CORE2023) in the title order of the portal.
+    The normalized titles and acronyms are joined into one text at load time, so a search is a substring scan
+    of that text instead of a loop over the rankings, and results are memoized per query.
+    The index is crawled once from all result pages of the portal and kept on disk in core_rankings_dir.
+    """
+
+    def __init__(self, source: str, rankings: List[ConferenceRanking]):
+        self.source = source
+        self.rankings = rankings
+        # one line "<title>\t<acronym>" per ranking, normalized keys contain neither tabs nor newlines
+        lines = [
+            f"{normalize_ranking_key(r.title)}\t{normalize_ranking_key(r.acronym)}"
+            for r in rankings
+        ]
+        self._text = "\n".join(lines)
+        self._line_starts = list(
+            itertools.accumulate((len(line) + 1 for line in lines), initial=0)
+        )
+        self._search_results: Dict[str, List[ConferenceRanking]] = {}
+
+    @classmethod
+    def path(cls, source: str) -> Path:
+        return core_rankings_dir / f"{source}.json"
+
+    @classmethod
+    def load(cls, source: str, refresh=False) -> "CoreRankingIndex":
+        path = cls.path(source)
+        if not refresh and path.exists():
+            with open(path, encoding="utf-8") as f:
+                rankings = [ConferenceRanking(**r) for r in json.load(f)]
+            return cls(source, rankings)
+        rankings, complete = crawl_core_ratings(source, refresh=refresh)
+        index = cls(source, rankings)
+        if not complete:  # used for this run only, the next run crawls again
+            print(f"Warning: incomplete crawl of {source}, {len(rankings)} rankings are not saved")
+        elif len(index.rankings) > 0:  # do not keep unknown editions
+            index.save()
+        return index
+
+    def save(self):
+        path = self.path(self.source)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([dataclasses.asdict(r) for r in self.rankings], f, indent=1)
+        os.replace(tmp_path, path)
+
+    def search(self, query: str) -> List[ConferenceRanking]:
+        """
+        Same result as the portal search by=all: all rankings containing query in title or acronym
+        """
+        key = normalize_ranking_key(query)
+        if key not in self._search_results:
+            self._search_results[key] = [self.rankings[i] for i in self._find_lines(key)]
+        return self._search_results[key]
+
+    def _find_lines(self, key: str) -> List[int]:
+        if key == "":
+            return list(range(len(self.rankings)))
+        lines = []
+        position = self._text.find(key)
+        while position != -1:
+            line = bisect.bisect_right(self._line_starts, position) - 1
+            if not lines or lines[-1] != line:  # title and acronym of a ranking can both match
+                lines.append(line)
+            position = self._text.find(key, position + 1)
+        return lines
+
+
+def crawl_core_ratings(
+    source: str, refresh=False
+) -> Tuple[List[ConferenceRanking], bool]:
+    """
+    All rankings of source and whether the crawl is complete, i.e. no result page failed
+    """
+    rankings = []
+    seen_links = set()
+    for page_number in range(1, max_core_result_pages + 1):
+        url = get_core_search_url("", source, page_number)
+        try:
+            page = fetch_page(url, refresh=refresh)
+        except Exception as e:
+            print(f"Error: could not open {url}: {e}")
+            metrics.count("fetch_errors")
+            return rankings, False
+        page_rankings = [
+            r for r in parse_core_ratings(page) if r.link not in seen_links
+        ]
+        if len(page_rankings) == 0:
+            break
+        seen_links.update(r.link for r in page_rankings)
+        rankings.extend(page_rankings)
+    return rankings, True
+
+
+_core_ranking_indexes: Dict[str, CoreRankingIndex] = {}
+# one lock per source, only lookups of the same edition wait for its crawl
+_core_ranking_index_locks: Dict[str, threading.Lock] = {}
+_core_ranking_indexes_lock = threading.Lock()
+_refresh_core_ranking_indexes = False
+
+
+def get_core_ranking_index(year: int) -> CoreRankingIndex:
+    source = f"CORE{year}"
+    with _core_ranking_indexes_lock:
+        source_lock = _core_ranking_index_locks.setdefault(source, threading.Lock())
+    with source_lock:
+        if source not in _core_ranking_indexes:
+            _core_ranking_indexes[source] = CoreRankingIndex.load(
+                source, refresh=_refresh_core_ranking_indexes
+            )
+        return _core_ranking_indexes[source]
+
+
+def refresh_core_ranking_indexes():
+    """
+    Rebuilds the indexes from the portal on next use, e.g. when a new CORE edition was published
+    """
+    global _refresh_core_ranking_indexes
+    with _core_ranking_indexes_lock:
+        _core_ranking_indexes.clear()
+        _refresh_core_ranking_indexes = True
+
+
 def get_matching_core_ranking(conference: ConferenceDeadline) -> ConferenceRanking:
-    conference_rankings = scrape_core_ratings(conference.title, conference.year)
-    for conference_ranking in conference_rankings:
+    index = get_core_ranking_index(conference.year)
+    # the candidates of the portal search in its order, the first full match is used as before
+    for conference_ranking in index.search(conference.title):
         score = compute_conference_ranking_match_score(conference, conference_ranking)
         if score == 1:
             return conference_ranking
@@ -0,0 +1,144 @@
+import datetime
+import re
+import zoneinfo
+from functools import lru_cache
+from typing import Dict, Optional
+
+format_wikicpf = "%b %d, %Y"
+datetime_format = "%Y-%m-%d %H:%M"  # output format
+date_format = "%Y-%m-%d"  # output format
+
+# Formats of dates in the data files, tried in this order
+stored_formats = [date_format, datetime_format, datetime_format + ":%S"]
+stored_pattern = re.compile(
+    r"\d{4}(?P<sep>[-/])\d{1,2}(?P=sep)\d{1,2}"
+    r"(?P<time> \d{1,2}:\d{1,2}(?P<seconds>:\d{1,2})?)?"
+)
+
+default_timezone = "UTC"
+# Timezone strings of conferences.yml which are no IANA names or UTC offsets
+timezone_aliases = {"PDT": "UTC-7", "AoE": "UTC-12"}
+utc_offset_pattern = re.compile(r"UTC(?P<sign>[+-])(?P<hours>\d{1,2})(?::(?P<minutes>\d{2}))?")
+
+# Formats of dates on scraped pages, otherwise dateutil is used
+scraped_formats = ["%m/%d/%Y %H:%M", "%m/%d/%Y"]
+scraped_patterns = [
+    (re.compile(r"\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{1,2}"), "%m/%d/%Y %H:%M"),
+    (re.compile(r"\d{1,2}/\d{1,2}/\d{4}"), "%m/%d/%Y"),
+    (re.compile(r"[A-Z][a-z]{2} \d{1,2}, \d{4}"), format_wikicpf),
+]
+
+
+def parse_stored_datetime(value) -> Optional[datetime.datetime]:
+    """
+    Parses dates like 2022-05-31, 2022-05-31 23:59 or 2022/05/31 23:59:00 as used in conferences.yml,
+    None if value is not such a date
+    """
+    if not isinstance(value, str):
+        return None
+    return _parse_stored_datetime(value)
+
+
+@lru_cache(maxsize=2 ** 16)
+def _parse_stored_datetime(value: str) -> Optional[datetime.datetime]:
+    match = stored_pattern.fullmatch(value)
+    if match is not None:
+        if match.group("seconds"):
+            dt_format = stored_formats[2]
+        elif match.group("time"):
+            dt_format = stored_formats[1]
+        else:
+            dt_format = stored_formats[0]
+        if match.group("sep") == "/":
+            dt_format = dt_format.replace("-", "/")
+        try:
+            return datetime.datetime.strptime(value, dt_format)
+        except ValueError:
+            pass
+    # slow path for everything strptime accepts but the pattern does not, e.g. leading spaces
+    for dt_format in stored_formats:
+        if "/" in value:
+            dt_format = dt_format.replace("-", "/")
+        try:
+            return datetime.datetime.strptime(value, dt_format)
+        except ValueError:
+            pass
+    return None
+
+
+def parse_scraped_datetime(value) -> Optional[datetime.datetime]:
+    """
+    Parses dates from WikiCFP pages like 05/31/2022, 05/31/2022 23:59 or May 31, 2022,
+    anything else is parsed with dateutil, None if value cannot be parsed
+    """
+    if not isinstance(value, str):
+        return None
+    return _parse_scraped_datetime(value)
+
+
+@lru_cache(maxsize=2 ** 16)
+def _parse_scraped_datetime(value: str) -> Optional[datetime.datetime]:
+    stripped = value.strip()
+    for pattern, dt_format in scraped_patterns:
+        if pattern.fullmatch(stripped):
+            try:
+                return datetime.datetime.strptime(stripped, dt_format)
+            except ValueError:
+                break
+    for dt_format in scraped_formats:
+        try:
+            return datetime.datetime.strptime(stripped, dt_format)
+        except ValueError:
+            pass
+    import dateutil.parser  # only needed for unusual formats
+
+    try:
+        return dateutil.parser.parse(value)
+    except (ValueError, OverflowError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def resolve_timezone(timezone: str) -> datetime.tzinfo:
+    """
+    Resolves the timezone strings of conferences.yml: IANA names like America/Los_Angeles and UTC offsets
+    like UTC-12 (Etc/GMT+12 in the tz database, the sign is flipped there), empty means UTC
+    """
+    name = (timezone or "").strip()
+    name = timezone_aliases.get(name, name) or default_timezone
+    match = utc_offset_pattern.fullmatch(name)
+    if match is not None:
+        offset = datetime.timedelta(
+            hours=int(match.group("hours")), minutes=int(match.group("minutes") or 0)
+        )
+        return datetime.timezone(offset if match.group("sign") == "+" else -offset)
+    if name == "UTC":
+        return datetime.timezone.utc
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        print(f"Warning: unknown timezone {timezone}, using {default_timezone}")
+        return datetime.timezone.utc
+
+
+@lru_cache(maxsize=2 ** 16)
+def get_utc_timestamp(value: datetime.datetime, timezone: str) -> float:
+    """
+    Seconds since the epoch of the local time value in timezone
+    """
+    return value.replace(tzinfo=resolve_timezone(timezone)).timestamp()
+
+
+def get_record_timestamp(record: Dict, key: str) -> Optional[float]:
+    """
+    Seconds since the epoch of the date field key of a record as loaded from yaml, in the timezone of the
+    record. None if the field is missing or no date, e.g. TBA.
+    """
+    value = record.get(key)
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())  # yaml loads 2022-09-18 as date
+    elif not isinstance(value, datetime.datetime):
+        value = parse_stored_datetime(value)
+    if value is None:
+        return None
+    return get_utc_timestamp(value, record.get("timezone") or "")
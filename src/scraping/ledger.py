@@ -0,0 +1,152 @@
+import datetime
+import hashlib
+import json
+import os
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import rescrape_interval, rescrape_interval_confirmed
+from src.scraping.models import ConferenceDeadline, ConferenceMasterData
+
+
+def get_wikicfp_event_id(url: str) -> str:
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+    return query.get("eventid", [""])[0]
+
+
+def compute_content_hash(conference: ConferenceDeadline) -> str:
+    content = json.dumps(conference.as_dict(), sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ScrapeLedger:
+    """
+    Persistent record of when each master data series was scraped last, keyed by series title.
+    Stores the last scrape time, the WikiCFP event id and a hash of the scraped deadline.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries: Dict[str, Dict] = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def record(self, title: str, conference: Optional[ConferenceDeadline]):
+        """
+        Records a successful scrape of title, conference is None if no matching deadline was found.
+        Failed scrapes are not recorded, so the series is selected again by the next run.
+        """
+        entry = self.entries.setdefault(title.lower(), {})
+        now = time.time()
+        entry["last_scraped"] = now
+        if conference is None:
+            return
+        content_hash = compute_content_hash(conference)
+        if entry.get("content_hash") != content_hash:
+            entry["last_changed"] = now
+        entry["content_hash"] = content_hash
+        entry["wikicfp_event_id"] = get_wikicfp_event_id(conference.wikicfp)
+
+    def last_scraped(self, title: str) -> float:
+        return self.entries.get(title.lower(), {}).get("last_scraped", 0)
+
+    def changed_at_last_scrape(self, title: str) -> bool:
+        """
+        The content hash changed at the last scrape of title, e.g. a new edition or a moved deadline
+        """
+        entry = self.entries.get(title.lower(), {})
+        return "last_changed" in entry and entry["last_changed"] == entry.get("last_scraped")
+
+    def select_for_scraping(
+        self,
+        conferences: List[ConferenceMasterData],
+        conference_deadlines: List[ConferenceDeadline],
+        now: datetime.datetime = None,
+    ) -> List[ConferenceMasterData]:
+        """
+        Skips series scraped less than rescrape_interval ago and series scraped less than
+        rescrape_interval_confirmed ago whose last scraped WikiCFP event is an upcoming deadline in
+        conference_deadlines, i.e. the next edition is known and was already seen.
+        The remaining series are ordered by their last scrape, never scraped series first and series whose
+        content changed at their last scrape before unchanged ones.
+        """
+        now = datetime.datetime.now() if now is None else now
+        timestamp = now.timestamp()
+        confirmed_event_ids = {
+            (c.title.lower(), get_wikicfp_event_id(c.wikicfp or ""))
+            for c in conference_deadlines
+            if isinstance(c.deadline, datetime.datetime) and c.deadline > now
+        }
+        selected = []
+        for conference in conferences:
+            age = timestamp - self.last_scraped(conference.title)
+            if age < rescrape_interval:
+                continue
+            event_id = self.entries.get(conference.title.lower(), {}).get("wikicfp_event_id")
+            if (
+                event_id
+                and (conference.title.lower(), event_id) in confirmed_event_ids
+                and age < rescrape_interval_confirmed
+            ):
+                continue
+            selected.append(conference)
+        return sorted(
+            selected,
+            key=lambda c: (
+                self.last_scraped(c.title) > 0,
+                not self.changed_at_last_scrape(c.title),
+                self.last_scraped(c.title),
+            ),
+        )
+
+
+class ScrapeCheckpoint:
+    """
+    Progress of the current scrape run: the series selected for the run and the series already done.
+    The checkpoint is removed when the run finished.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.selected: List[str] = []
+        self.done: List[str] = []
+        if self.exists():
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.selected, self.done = data["selected"], data["done"]
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"selected": self.selected, "done": self.done}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def start(self, titles: List[str]):
+        self.selected, self.done = list(titles), []
+        self.save()
+
+    def pending(self) -> List[str]:
+        done = set(self.done)
+        return [title for title in self.selected if title not in done]
+
+    def mark_done(self, title: str):
+        self.done.append(title)
+        self.save()
+
+    def finish(self):
+        self.path.unlink(missing_ok=True)
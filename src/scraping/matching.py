@@ -1,4 +1,7 @@
 import difflib
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Hashable, List, Sequence, Set, Tuple
 
 from src.scraping.models import (
     ConferenceMasterData,
@@ -8,6 +11,7 @@ from src.scraping.models import (
 )
 
 
+@lru_cache(maxsize=2 ** 16)
 def clean_wikicfp_title(title: str) -> str:
     wikicfp_replace_strings = ["dagm", "ieee", "--ei", "-", "scopus", "&", "acm"]
     for replace_string in wikicfp_replace_strings:
@@ -15,6 +19,16 @@ def clean_wikicfp_title(title: str) -> str:
     return title
 
 
+@lru_cache(maxsize=2 ** 16)
+def normalize_candidate_name(full_name: str) -> str:
+    return clean_wikicfp_title(full_name.lower())
+
+
+@lru_cache(maxsize=2 ** 16)
+def to_lower(text: str) -> str:
+    return text.lower()
+
+
 def compute_conference_match_score(
     conference: ConferenceMasterData,
     conference_candidate: ConferenceCandidateCFP,
@@ -22,8 +36,8 @@ def compute_conference_match_score(
 ):
     score = len(
         difflib.get_close_matches(
-            clean_wikicfp_title(conference_candidate.full_name.lower()),
-            [conference.title.lower(), conference.full_name.lower()],
+            normalize_candidate_name(conference_candidate.full_name),
+            [to_lower(conference.title), to_lower(conference.full_name)],
             cutoff=cutoff,
         )
     )
@@ -35,9 +49,172 @@ def compute_conference_ranking_match_score(
 ):
     score = len(
         difflib.get_close_matches(
-            conference_candidate.title.lower(),
-            [conference.title.lower(), conference.full_name.lower()],
+            to_lower(conference_candidate.title),
+            [to_lower(conference.title), to_lower(conference.full_name)],
             cutoff=cutoff,
         )
     )
     return score
+
+
+def get_ngrams(text: str, n: int) -> Counter:
+    return Counter(text[i : i + n] for i in range(len(text) - n + 1))
+
+
+def get_ngram_occurrences(text: str, n: int) -> Set[Tuple[str, int]]:
+    """
+    n-grams numbered by occurrence, the size of the intersection of two such sets is the size of the
+    multiset intersection of the n-grams
+    """
+    return {
+        (ngram, k) for ngram, count in get_ngrams(text, n).items() for k in range(count)
+    }
+
+
+def get_lcs_length(text: str, char_masks: Dict[str, int], length_b: int) -> int:
+    """
+    Length of the longest common subsequence of text and b (bit-parallel, Allison-Dix),
+    char_masks[c] has bit j set if b[j] == c
+    """
+    all_bits = (1 << length_b) - 1
+    v = all_bits
+    for char in text:
+        u = v & char_masks.get(char, 0)
+        v = ((v + u) | (v - u)) & all_bits
+    return length_b - bin(v).count("1")
+
+
+class MatchIndex:
+    """
+    Character n-gram inverted index over texts for batch fuzzy matching with the same decisions as
+    difflib.get_close_matches(query, texts, cutoff).
+
+    Candidates are narrowed without losing matches, since difflib's ratio 2 * M / T (M matched characters,
+    T total length) is at most 2 * LCS / T:
+    - lengths: 2 * min(len_a, len_b) / T >= cutoff (difflib's real_quick_ratio)
+    - n-grams: at most D = T * (1 - cutoff) characters are inserted or deleted, each of which destroys at
+      most n shared n-grams, so a match shares at least max(len_a, len_b) - n + 1 - n * D n-grams.
+      Only texts sharing one of the rarest n-grams of the query need to be counted.
+    - shared characters: 2 * (size of the multiset intersection) / T >= cutoff (difflib's quick_ratio)
+    - longest common subsequence: 2 * LCS / T >= cutoff
+    The remaining candidates are scored with difflib.SequenceMatcher.
+
+    :param keys: key of each text, scores are counted per key (several texts can share a key)
+    """
+
+    def __init__(self, keys: Sequence[Hashable], texts: Sequence[str], n=2):
+        self.keys = list(keys)
+        self.texts = list(texts)
+        self.n = n
+        self.ngrams = [get_ngram_occurrences(text, n) for text in self.texts]
+        self.chars = [get_ngram_occurrences(text, 1) for text in self.texts]
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.ids_by_length: Dict[int, List[int]] = defaultdict(list)
+        for i, text in enumerate(self.texts):
+            self.ids_by_length[len(text)].append(i)
+            for ngram, k in self.ngrams[i]:
+                if k == 0:
+                    self.postings[ngram].append(i)
+
+    @classmethod
+    def from_master_data(
+        cls, conferences: Sequence[ConferenceMasterData], n=2
+    ) -> "MatchIndex":
+        """
+        Index over title and full name of conferences, keys are the positions in conferences
+        """
+        keys, texts = [], []
+        for i, conference in enumerate(conferences):
+            keys += [i, i]
+            texts += [to_lower(conference.title), to_lower(conference.full_name)]
+        return cls(keys, texts, n)
+
+    def min_shared_ngrams(self, length_a: int, length_b: int, cutoff: float) -> int:
+        max_edits = int((length_a + length_b) * (1 - cutoff) + 1e-9)
+        return max(length_a, length_b) - self.n + 1 - self.n * max_edits
+
+    def candidate_ids(self, query: str, cutoff: float) -> List[int]:
+        length_query = len(query)
+        candidates = []
+        min_shared_by_length = {}
+        for length, ids in self.ids_by_length.items():
+            total_length = length + length_query
+            if 2 * min(length, length_query) < cutoff * total_length:
+                continue
+            min_shared = self.min_shared_ngrams(length, length_query, cutoff)
+            if min_shared <= 0:
+                candidates.extend(ids)
+            else:
+                min_shared_by_length[length] = min_shared
+        if len(min_shared_by_length) == 0:
+            return sorted(candidates)
+
+        # texts sharing none of the rarest n-grams share at most min_shared - 1 n-grams
+        query_ngrams = get_ngrams(query, self.n)
+        ngrams = sorted(query_ngrams, key=lambda g: len(self.postings.get(g, [])))
+        skip_budget = min(min_shared_by_length.values()) - 1
+        while ngrams and query_ngrams[ngrams[-1]] <= skip_budget:
+            skip_budget -= query_ngrams[ngrams.pop()]
+        probe_ids = set()
+        for ngram in ngrams:
+            probe_ids.update(self.postings.get(ngram, []))
+        query_ngram_occurrences = get_ngram_occurrences(query, self.n)
+        for i in probe_ids:
+            min_shared = min_shared_by_length.get(len(self.texts[i]))
+            if min_shared is None:
+                continue
+            if len(query_ngram_occurrences & self.ngrams[i]) >= min_shared:
+                candidates.append(i)
+        return sorted(candidates)
+
+    def matching_ids(self, query: str, cutoff=0.8) -> List[int]:
+        """
+        Ids of texts with difflib ratio >= cutoff, ratio <= quick_ratio <= real_quick_ratio,
+        so these are the texts get_close_matches accepts
+        """
+        char_masks = defaultdict(int)
+        for j, char in enumerate(query):
+            char_masks[char] |= 1 << j
+        query_chars = get_ngram_occurrences(query, 1)
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        ids = []
+        for i in self.candidate_ids(query, cutoff):
+            text = self.texts[i]
+            total_length = len(text) + len(query)
+            # difflib's quick_ratio
+            if 2 * len(query_chars & self.chars[i]) < cutoff * total_length:
+                continue
+            lcs_length = get_lcs_length(text, char_masks, len(query))
+            if 2 * lcs_length < cutoff * total_length:
+                continue
+            matcher.set_seq1(text)
+            if matcher.ratio() >= cutoff:
+                ids.append(i)
+        return ids
+
+    def scores(self, query: str, cutoff=0.8) -> Dict[Hashable, int]:
+        """
+        Number of matching texts per key, only keys with at least one match
+        """
+        return dict(Counter(self.keys[i] for i in self.matching_ids(query, cutoff)))
+
+    def scores_many(
+        self, queries: Sequence[str], cutoff=0.8
+    ) -> List[Dict[Hashable, int]]:
+        cache = {}
+        for query in queries:
+            if query not in cache:
+                cache[query] = self.scores(query, cutoff)
+        return [cache[query] for query in queries]
+
+    def match_candidates(
+        self, conference_candidates: Sequence[ConferenceCandidateCFP], cutoff=0.8
+    ) -> List[Dict[Hashable, int]]:
+        """
+        Same scores as compute_conference_match_score for an index built with from_master_data
+        """
+        return self.scores_many(
+            [normalize_candidate_name(c.full_name) for c in conference_candidates],
+            cutoff,
+        )
@@ -0,0 +1,258 @@
+import json
+import math
+import os
+import random
+import threading
+import time
+import urllib.parse
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+latency_quantiles = [0.5, 0.9, 0.99]
+# Latencies kept per host for the quantiles, a uniform sample of all requests once there are more
+latency_sample_size = 1024
+
+
+def get_host(url: str) -> str:
+    """
+    Hostname of url with its port if given, e.g. 127.0.0.1:8001 for a local server
+    """
+    parts = urllib.parse.urlsplit(url)
+    host = parts.hostname or ""
+    return f"{host}:{parts.port}" if parts.port else host
+
+
+def get_quantile(sorted_values: List[float], quantile: float) -> float:
+    """
+    Nearest-rank quantile of sorted values, 0 for no values
+    """
+    if len(sorted_values) == 0:
+        return 0.0
+    return sorted_values[max(math.ceil(quantile * len(sorted_values)) - 1, 0)]
+
+
+class HostMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.not_modified = 0
+        self.statuses = Counter()
+        self.latency_total = 0.0
+        self.latencies: List[float] = []  # reservoir sample, see add_latency
+        self.sleep_seconds: Dict[str, float] = defaultdict(float)
+
+    def add_latency(self, seconds: float):
+        """
+        Keeps a uniform sample of at most latency_sample_size latencies (reservoir sampling),
+        call after counting the request
+        """
+        self.latency_total += seconds
+        if len(self.latencies) < latency_sample_size:
+            self.latencies.append(seconds)
+        else:
+            i = random.randrange(self.requests)
+            if i < latency_sample_size:
+                self.latencies[i] = seconds
+
+    def as_dict(self) -> Dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "cache_hits": self.cache_hits,
+            "not_modified": self.not_modified,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "latency_seconds": {
+                "total": self.latency_total,
+                **{
+                    f"p{round(q * 100)}": get_quantile(latencies, q)
+                    for q in latency_quantiles
+                },
+            },
+            "sleep_seconds": dict(self.sleep_seconds),
+        }
+
+
+class RunMetrics:
+    """
+    Per-stage timers, event counters and per-host HTTP metrics of a run, shared by all scraping threads.
+    Stages run concurrently, so their seconds are summed over the threads and can exceed the run time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.stage_seconds: Dict[str, List[float]] = defaultdict(list)
+            self.counters = Counter()
+            self.hosts: Dict[str, HostMetrics] = defaultdict(HostMetrics)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.stage_seconds[name].append(seconds)
+
+    def count(self, name: str, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def record_request(self, url: str, seconds: float, status: int = None, size=0):
+        """
+        :param status: None if the request failed without response
+        """
+        with self._lock:
+            host = self.hosts[get_host(url)]
+            host.requests += 1
+            host.add_latency(seconds)
+            host.bytes += size
+            if status is None:
+                host.errors += 1
+            else:
+                host.statuses[status] += 1
+
+    def record_retry(self, url: str):
+        with self._lock:
+            self.hosts[get_host(url)].retries += 1
+
+    def record_sleep(self, url: str, reason: str, seconds: float):
+        """
+        :param reason: e.g. rate_limit or backoff
+        """
+        with self._lock:
+            self.hosts[get_host(url)].sleep_seconds[reason] += seconds
+
+    def record_cache_hit(self, url: str, not_modified=False):
+        """
+        :param not_modified: the cached response was revalidated with a 304 instead of used without request
+        """
+        with self._lock:
+            host = self.hosts[get_host(url)]
+            if not_modified:
+                host.not_modified += 1
+            else:
+                host.cache_hits += 1
+
+    def report(self, **info) -> Dict:
+        """
+        :param info: additional entries of the report, e.g. the number of scraped series
+        """
+        with self._lock:
+            finished_at = time.time()
+            return {
+                "started_at": self.started_at,
+                "finished_at": finished_at,
+                "duration_seconds": finished_at - self.started_at,
+                **info,
+                "stages": {
+                    name: {
+                        "count": len(seconds),
+                        "seconds": sum(seconds),
+                        "max_seconds": max(seconds),
+                    }
+                    for name, seconds in self.stage_seconds.items()
+                },
+                "counters": dict(self.counters),
+                "hosts": {host: metrics.as_dict() for host, metrics in sorted(self.hosts.items())},
+            }
+
+
+metrics = RunMetrics()
+
+
+def write_file(path: Path, text: str):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_run_report(path: Path, report: Dict):
+    write_file(path, json.dumps(report, indent=1) + "\n")
+
+
+def escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_prometheus_textfile(path: Path, report: Dict, prefix="deadlines_scrape"):
+    """
+    Writes the report in the Prometheus text format, e.g. for the textfile collector of the node exporter
+    """
+    stages, hosts = report["stages"], report["hosts"]
+    # name -> (help, samples as (labels, value))
+    gauges = {
+        "last_run_timestamp_seconds": ("End of the last run.", [({}, report["finished_at"])]),
+        "duration_seconds": ("Duration of the last run.", [({}, report["duration_seconds"])]),
+        "stage_seconds": (
+            "Seconds spent per stage, summed over threads.",
+            [({"stage": name}, stage["seconds"]) for name, stage in stages.items()],
+        ),
+        "stage_calls": (
+            "Calls per stage.",
+            [({"stage": name}, stage["count"]) for name, stage in stages.items()],
+        ),
+        "events": (
+            "Events counted during the run.",
+            [({"event": name}, n) for name, n in report["counters"].items()],
+        ),
+    }
+    for key, help_text in [
+        ("requests", "HTTP requests per host."),
+        ("errors", "HTTP requests without response per host."),
+        ("retries", "Retried HTTP requests per host."),
+        ("bytes", "Received body bytes per host."),
+        ("cache_hits", "Responses served from the cache without request per host."),
+        ("not_modified", "Cached responses revalidated with 304 per host."),
+    ]:
+        gauges[f"http_{key}"] = (
+            help_text,
+            [({"host": host}, host_metrics[key]) for host, host_metrics in hosts.items()],
+        )
+    gauges["http_latency_seconds"] = (
+        "Latency quantiles of the HTTP requests per host.",
+        [
+            (
+                {"host": host, "quantile": f"{q}"},
+                host_metrics["latency_seconds"][f"p{round(q * 100)}"],
+            )
+            for host, host_metrics in hosts.items()
+            for q in latency_quantiles
+        ],
+    )
+    gauges["http_sleep_seconds"] = (
+        "Seconds slept per host and reason.",
+        [
+            ({"host": host, "reason": reason}, seconds)
+            for host, host_metrics in hosts.items()
+            for reason, seconds in host_metrics["sleep_seconds"].items()
+        ],
+    )
+
+    lines = []
+    for name, (help_text, samples) in gauges.items():
+        lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} gauge"]
+        for labels, value in samples:
+            label_text = ",".join(
+                f'{key}="{escape_label_value(val)}"' for key, val in labels.items()
+            )
+            lines.append(
+                f"{prefix}_{name}{{{label_text}}} {value}" if labels else f"{prefix}_{name} {value}"
+            )
+    write_file(path, "\n".join(lines) + "\n")
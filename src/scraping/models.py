@@ -1,26 +1,69 @@
+import time
 from dataclasses import dataclass
 from datetime import datetime, date
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional
 
-from src.scraping.utils import datetime_to_string, datetime_format, date_format
+from src.scraping.dates import parse_stored_datetime, get_utc_timestamp
+from src.scraping.utils import datetime_to_string, date_format
+
+
+@lru_cache(maxsize=2 ** 16)
+def format_deadline(val) -> str:
+    return datetime_to_string(val, date_format) + " 23:59"
+
+
+@lru_cache(maxsize=2 ** 16)
+def format_date(val) -> str:
+    return datetime_to_string(val, date_format)
 
 
 def attributes_as_dict(instance):
     res = {}
-    for key, val in instance.__dict__.items():
-        if key in ["__len__"]:
-            continue
+    for key in instance.__slots__:
+        val = getattr(instance, key)
         if val not in ["", None]:
             if key in ["deadline", "abstract_deadline"]:
-                res[key] = datetime_to_string(val, date_format) + " 23:59"
+                res[key] = format_deadline(val)
             elif key in ["start", "end"]:
-                res[key] = datetime_to_string(val, date_format)
+                res[key] = format_date(val)
             else:
                 res[key] = val
     return res
 
 
-@dataclass
+class LazyDatetime:
+    """
+    Descriptor around the slot of a date field: values are stored as given and date strings are parsed
+    on first access
+    """
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        val = self.slot.__get__(instance, owner)
+        if val is not None and not isinstance(val, (datetime, date)):
+            val = parse_stored_datetime(val)
+            self.slot.__set__(instance, val)
+        return val
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+
+def lazy_datetimes(*keys):
+    def decorator(cls):
+        for key in keys:
+            setattr(cls, key, LazyDatetime(cls.__dict__[key]))
+        return cls
+
+    return decorator
+
+
+@dataclass(slots=True)
 class ConferenceMasterData:
     title: str = ""
     full_name: str = ""
@@ -34,7 +77,7 @@ class ConferenceMasterData:
         return attributes_as_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConferenceCandidateCFP:
     title: str = ""
     wikicfp_link: str = ""
@@ -45,7 +88,7 @@ class ConferenceCandidateCFP:
         return attributes_as_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConferenceRanking:
     title: str  # full_name in other classes
     acronym: str  # title in other classes
@@ -62,7 +105,8 @@ class ConferenceRanking:
         return attributes_as_dict(self)
 
 
-@dataclass
+@lazy_datetimes("deadline", "abstract_deadline", "start", "end")
+@dataclass(slots=True)
 class ConferenceDeadline:
     title: str = ""
     year: int = None
@@ -87,29 +131,8 @@ class ConferenceDeadline:
     wikicfp_comment: str = ""
 
     def __post_init__(self):
-        # Convert date strings into datetime objects
-        for key in ["deadline", "abstract_deadline", "start", "end"]:
-            val = self.__dict__[key]
-            if (
-                val is not None
-                and not isinstance(val, datetime)
-                and not isinstance(val, date)
-            ):
-                for dt_format in [
-                    date_format,
-                    datetime_format,
-                    datetime_format + ":%S",
-                ]:
-                    try:
-                        if "/" in val:
-                            dt_format = dt_format.replace("-", "/")
-                        d = datetime.strptime(val, dt_format)
-                        break
-                    except:
-                        d = None
-                        pass
-                self.__dict__[key] = d
-        if self.ranking not in ["A*", "A", "B", "C"]:
+        # Date strings are converted into datetime objects on first access, see lazy_datetimes
+        if self.ranking not in ["A*", "As", "A", "B", "C"]:
             if self.ranking not in ["", "N/A", "NA"]:
                 print(f"Ranking of {self.id} set to: {self.ranking}")
             self.ranking = ""
@@ -117,17 +140,38 @@ class ConferenceDeadline:
             self.ranking = "As"
         return self
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ConferenceDeadline":
+        """
+        Model of a stored record, keys which are no fields (e.g. added by feeds or by hand) are left out
+        """
+        return cls(**{key: val for key, val in data.items() if key in cls.__slots__})
+
     def as_dict(self) -> Dict:
         return attributes_as_dict(self)
 
+    @property
+    def deadline_utc(self) -> Optional[float]:
+        """
+        Deadline in seconds since the epoch, None if there is no deadline
+        """
+        if self.deadline is None:
+            return None
+        return get_utc_timestamp(self.deadline, self.timezone)
+
+    def deadline_passed(self, now: float = None) -> bool:
+        deadline = self.deadline_utc
+        return deadline is not None and deadline < (time.time() if now is None else now)
+
     def update_from_candidate(self, new_conference: "ConferenceDeadline"):
         updated = False
+        existing_keys = self.as_dict().keys()
         for key in new_conference.as_dict().keys():
-            val = new_conference.__dict__[key]
-            if key in self.as_dict().keys():
-                if val != self.__dict__[key]:
+            val = getattr(new_conference, key)
+            if key in existing_keys:
+                if val != getattr(self, key):
                     updated = True
-                    self.__dict__[key] = val
+                    setattr(self, key, val)
             else:
-                self.__dict__[key] = val
+                setattr(self, key, val)
         return updated
@@ -0,0 +1,49 @@
+from typing import Dict
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.config import html_parser_backend
+
+
+def parse_html_soup(page, name: str, attrs: Dict[str, str]) -> BeautifulSoup:
+    return BeautifulSoup(page, "html.parser")
+
+
+def parse_html_strainer(page, name: str, attrs: Dict[str, str]) -> BeautifulSoup:
+    return BeautifulSoup(page, "html.parser", parse_only=SoupStrainer(name, attrs))
+
+
+def parse_html_lxml(page, name: str, attrs: Dict[str, str]) -> BeautifulSoup:
+    import lxml.html  # optional dependency, only needed for this backend
+
+    conditions = []
+    for key, val in attrs.items():
+        if key == "class":
+            conditions.append(
+                f"contains(concat(' ', normalize-space(@class), ' '), ' {val} ')"
+            )
+        else:
+            conditions.append(f"@{key}='{val}'")
+    predicate = " and ".join(conditions)
+    xpath = f"//{name}[{predicate}][not(ancestor::{name}[{predicate}])]"
+    elements = lxml.html.fromstring(page).xpath(xpath)
+    subtree = "".join(
+        lxml.html.tostring(e, encoding="unicode", with_tail=False) for e in elements
+    )
+    return BeautifulSoup(subtree, "html.parser")
+
+
+html_parser_backends = {
+    "soup": parse_html_soup,
+    "strainer": parse_html_strainer,
+    "lxml": parse_html_lxml,
+}
+
+
+def parse_html(page, name: str, attrs: Dict[str, str], backend=None) -> BeautifulSoup:
+    """
+    Parses the elements name with attrs of page (and everything inside of them).
+    Depending on the backend the rest of the page is skipped, so only select within these elements.
+    """
+    backend = html_parser_backend if backend is None else backend
+    return html_parser_backends[backend](page, name, attrs)
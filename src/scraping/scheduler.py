@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator
+
+from src.config import request_intervals, scrape_workers
+from src.scraping import session
+from src.scraping.cache import http_cache
+from src.scraping.metrics import get_host, metrics
+
+
+def get_rate_limit_host(url: str) -> str:
+    """
+    Host (and port) of url without www., both spellings of a host share one rate limit
+    """
+    host = get_host(url)
+    return host[len("www.") :] if host.startswith("www.") else host
+
+
+class HostRateLimiter:
+    """
+    Enforces a minimum interval between two requests to the same host (see get_rate_limit_host).
+    Requests to different hosts do not wait for each other.
+    """
+
+    def __init__(self, intervals: Dict[str, float] = None, default_interval=0.0):
+        """
+        :param intervals: seconds by url of the host, e.g. the base url of a site
+        """
+        self.intervals = {
+            get_rate_limit_host(url): interval for url, interval in (intervals or {}).items()
+        }
+        self.default_interval = default_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url: str):
+        host = get_rate_limit_host(url)
+        interval = self.intervals.get(host, self.default_interval)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        if slot > now:
+            metrics.record_sleep(url, "rate_limit", slot - now)
+            time.sleep(slot - now)
+
+
+rate_limiter = HostRateLimiter(request_intervals)
+
+
+def download(url: str, headers: Dict[str, str] = None):
+    response = session.get(url, headers, before_request=lambda: rate_limiter.wait(url))
+    if response.status_code == 304:  # not modified since cached response
+        return response.status_code, dict(response.headers), b""
+    response.raise_for_status()
+    return response.status_code, dict(response.headers), response.content
+
+
+def fetch_page(url: str, refresh=False) -> bytes:
+    """
+    Returns the body of url, served from http_cache where possible.
+    Only requests which go to the network are rate limited.
+    """
+    return http_cache.fetch(url, download, refresh=refresh)
+
+
+def map_concurrently(
+    function: Callable, items: Iterable, max_workers=scrape_workers
+) -> Iterator:
+    """
+    Applies function to all items in a thread pool, results are yielded in the order of items
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        yield from executor.map(function, items)
+    finally:  # do not wait for pending items if the consumer stops early, e.g. on Ctrl-C
+        executor.shutdown(wait=True, cancel_futures=True)
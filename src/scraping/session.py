@@ -0,0 +1,79 @@
+import random
+import time
+from typing import Callable, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import (
+    http_connect_timeout,
+    http_read_timeout,
+    http_max_retries,
+    http_backoff_factor,
+    http_backoff_max,
+    scrape_workers,
+)
+from src.scraping.metrics import metrics
+
+retry_status_codes = {429, 500, 502, 503, 504}
+
+
+def create_session() -> requests.Session:
+    """
+    Session with keep-alive connection pools per host, shared by all scraping threads.
+    requests asks for and decodes gzip/deflate responses by default.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=scrape_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+session = create_session()
+
+
+def get_backoff(attempt: int, response: requests.Response = None) -> float:
+    if response is not None and response.headers.get("Retry-After", "").isdigit():
+        return min(float(response.headers["Retry-After"]), http_backoff_max)
+    return random.uniform(0, min(http_backoff_factor * 2 ** attempt, http_backoff_max))
+
+
+def get(
+    url: str,
+    headers: Dict[str, str] = None,
+    before_request: Callable[[], None] = None,
+    max_retries=http_max_retries,
+) -> requests.Response:
+    """
+    GET with timeouts and up to max_retries retries with jittered exponential backoff on connection errors,
+    timeouts and retry_status_codes. Every attempt, retry and backoff is recorded in metrics.
+
+    :param before_request: called before every attempt, e.g. to wait for the rate limit
+    """
+    for attempt in range(max_retries + 1):
+        if before_request is not None:
+            before_request()
+        start = time.perf_counter()
+        try:
+            response = session.get(
+                url, headers=headers, timeout=(http_connect_timeout, http_read_timeout)
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            metrics.record_request(url, time.perf_counter() - start)
+            if attempt == max_retries:
+                raise
+            backoff(url, get_backoff(attempt))
+            continue
+        metrics.record_request(
+            url, time.perf_counter() - start, response.status_code, len(response.content)
+        )
+        if response.status_code not in retry_status_codes or attempt == max_retries:
+            return response
+        backoff(url, get_backoff(attempt, response))
+
+
+def backoff(url: str, seconds: float):
+    metrics.record_retry(url)
+    metrics.record_sleep(url, "backoff", seconds)
+    time.sleep(seconds)
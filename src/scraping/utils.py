@@ -1,28 +1,17 @@
 import datetime
 
-import dateutil.parser
+from src.scraping.dates import (
+    format_wikicpf,
+    datetime_format,
+    date_format,
+    parse_scraped_datetime,
+)
 
-format_wikicpf = "%b %d, %Y"
 format_conf_date = "%B %d, %Y"
-datetime_format = "%Y-%m-%d %H:%M"  # output format
-date_format = "%Y-%m-%d"  # output format
 
 
 def get_datetime(datetime_string: str):
-    date = None
-    for format in ["%y/%d/%m %h:%m", "%m/%d/%Y %H:%M", "%m/%d/%Y"]:
-        try:
-            date = datetime.datetime.strptime(datetime_string.strip(), format)
-            break
-        except Exception as e:
-            # print(f"{e}          [for {format}]")
-            pass
-    if date is None:
-        try:
-            date = dateutil.parser.parse(datetime_string)
-        except Exception as e:
-            pass
-    return date
+    return parse_scraped_datetime(datetime_string)
 
 
 def datetime_to_string(dt, format):
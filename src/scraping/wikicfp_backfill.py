@@ -0,0 +1,141 @@
+"""
+Offline backfill of conference histories from archived WikiCFP pages.
+
+The archive is a directory (searched recursively) of saved search result and series pages and of saved event
+pages. Event pages are linked to the list entries by the eventid in their file name, as saved from the url
+(event.showcfp?eventid=123&...) or as 123.html. The pages are parsed in a process pool, nothing is fetched.
+"""
+import dataclasses
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.config import (
+    csv_path_master_data,
+    wikicfp_base_url,
+    yaml_path_conference_backfill,
+)
+from src.io import load_conferences, load_csv, save_yaml
+from src.scraping.matching import MatchIndex
+from src.scraping.models import (
+    ConferenceCandidateCFP,
+    ConferenceDeadline,
+    ConferenceMasterData,
+)
+from src.scraping.wikicfp_deadlines import (
+    convert_wikicfp2deadline,
+    parse_conference_candidates,
+    parse_event_page,
+)
+from src.store import ConferenceStore
+
+eventid_pattern = re.compile(r"eventid=(\d+)")
+
+
+def get_event_id(text: str) -> Optional[str]:
+    match = eventid_pattern.search(text)
+    return match.group(1) if match else None
+
+
+def get_archived_event_id(path: Path) -> Optional[str]:
+    event_id = get_event_id(path.name)
+    if event_id is None and path.stem.isdigit():
+        event_id = path.stem
+    return event_id
+
+
+def parse_archived_page(path: Path) -> Tuple[str, Optional[str], object]:
+    """
+    Runs in the worker processes. Returns ("event", eventid, event data) for event pages (they have the
+    table.gglu with the dates), ("list", None, candidates as dicts) for search result and series pages and
+    ("error", None, None) for pages which cannot be parsed.
+    """
+    page = path.read_bytes()
+    try:
+        if b"gglu" in page:
+            event_id = get_archived_event_id(path)
+            url = f"{wikicfp_base_url}/cfp/servlet/event.showcfp?eventid={event_id}"
+            return "event", event_id, parse_event_page(page, url)
+        # search results are in the second table of the page, the events of a series in the fourth
+        table_id = 1 if b"Search Result" in page else 3
+        candidates = parse_conference_candidates(page, table_id)
+        return "list", None, [dataclasses.asdict(c) for c in candidates]
+    except Exception as e:
+        print(f"Error: could not parse {path}: {e}")
+        return "error", None, None
+
+
+def backfill_conference_histories(
+    archive_dir: Path, conferences: List[ConferenceMasterData], workers: int = None
+) -> Dict[str, List[ConferenceDeadline]]:
+    """
+    Deadlines of all years found in the archive per master data series, sorted by year. Unlike
+    find_conference_from_candidates candidates of any year are used, per series and year the first
+    candidate with an archived event page is converted.
+
+    :param workers: number of processes, default: number of CPUs
+    """
+    paths = sorted(p for p in Path(archive_dir).rglob("*") if p.is_file())
+    events: Dict[str, Dict] = {}
+    candidates: Dict[str, Dict] = {}  # by link, a series is listed on several pages
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for kind, event_id, data in executor.map(parse_archived_page, paths, chunksize=16):
+            if kind == "event":
+                if event_id is None:
+                    print("Warning: skipped an event page without eventid in its file name")
+                else:
+                    events[event_id] = data
+            elif kind == "list":
+                for candidate in data:
+                    candidates.setdefault(candidate["wikicfp_link"], candidate)
+
+    histories: Dict[str, Dict[int, ConferenceDeadline]] = {c.title: {} for c in conferences}
+    index = MatchIndex.from_master_data(conferences)
+    candidates = list(candidates.values())
+    scores = index.match_candidates([ConferenceCandidateCFP(**c) for c in candidates])
+    for candidate, candidate_scores in zip(candidates, scores):
+        details = events.get(get_event_id(candidate["wikicfp_link"]))
+        if details is None:  # event page not archived
+            continue
+        for i in candidate_scores:
+            conference = conferences[i]
+            history = histories[conference.title]
+            if candidate["year"] in history:
+                continue
+            conference_data = {
+                **details,
+                **candidate,
+                "wikicfp": candidate["wikicfp_link"],
+            }
+            try:
+                history[candidate["year"]] = convert_wikicfp2deadline(
+                    conference_data, conference
+                )
+            except Exception as e:
+                print(f"Error: could not convert {candidate['wikicfp_link']}: {e}")
+    return {
+        title: [history[year] for year in sorted(history)]
+        for title, history in histories.items()
+    }
+
+
+def backfill_from_archive(
+    archive_dir: Path, output_path: Path = yaml_path_conference_backfill, workers: int = None
+) -> List[ConferenceDeadline]:
+    """
+    Writes the histories of all master data series found in the archive to output_path
+    """
+    conferences = [
+        ConferenceMasterData(**conf_dict) for conf_dict in load_csv(csv_path_master_data)
+    ]
+    histories = backfill_conference_histories(archive_dir, conferences, workers)
+    conference_deadlines = [c for history in histories.values() for c in history]
+    existing = ConferenceStore(load_conferences(full=True))
+    new_count = sum(1 for c in conference_deadlines if existing.get_lower(c.id) is None)
+    save_yaml(output_path, [c.as_dict() for c in conference_deadlines])
+    print(
+        f"{len(conference_deadlines)} deadlines of {sum(1 for h in histories.values() if h)} series "
+        f"written to {output_path}, {new_count} of them are not in the conference data"
+    )
+    return conference_deadlines
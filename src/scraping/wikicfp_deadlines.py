@@ -1,26 +1,36 @@
+import dataclasses
 import datetime
-import time
-import urllib.request
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 import tqdm
-from bs4 import BeautifulSoup
 
 from src.config import (
-    yaml_path_conferences,
     csv_path_master_data,
     yaml_path_conference_new_candidates,
     yaml_path_conference_updated_candidates,
+    json_path_scrape_ledger,
+    json_path_scrape_checkpoint,
+    json_path_scrape_report,
+    prometheus_textfile_path,
+    wikicfp_base_url,
 )
-from src.io import load_yaml, load_csv, save_yaml
-from src.scraping.core_conference_rankings import get_matching_core_ranking
+from src.io import load_conferences, load_csv, save_yaml, append_yaml
+from src.store import ConferenceStore
+from src.scraping.core_conference_rankings import (
+    get_matching_core_ranking,
+    refresh_core_ranking_indexes,
+)
+from src.scraping.ledger import ScrapeLedger, ScrapeCheckpoint
 from src.scraping.models import (
     ConferenceMasterData,
     ConferenceCandidateCFP,
     ConferenceDeadline,
 )
 from src.scraping.matching import compute_conference_match_score
+from src.scraping.metrics import metrics, write_prometheus_textfile, write_run_report
+from src.scraping.parsing import parse_html
+from src.scraping.scheduler import fetch_page, map_concurrently
 from src.scraping.utils import (
     format_conf_date,
     get_datetime,
@@ -31,80 +41,207 @@ from src.scraping.utils import (
 project_root = Path(__file__).parent.parent
 
 
-def scrape_update_suggestions_from_wikicfp():
+class ScrapeError(Exception):
+    """
+    A page of the series could not be fetched, the series has to be scraped again
+    """
+
+
+def scrape_update_suggestions_from_wikicfp(
+    full=False, refresh_rankings=False, restart=False
+):
+    """
+    Streams the scraped series through the stages candidates, matching, detail fetch (scrape_new_conference_deadline),
+    ranking enrichment (scrape_new_conference_deadline_with_ranking) and diff (diff_conference_deadlines).
+    New and updated candidates are appended to the candidate files as soon as a series is done and the progress is
+    kept in a checkpoint, so an interrupted run continues where it stopped.
+    The time per stage and the HTTP metrics per host are written to the run report json_path_scrape_report and,
+    if configured, to a Prometheus textfile.
+
+    :param full: scrape all master data series, otherwise series which cannot have changed are skipped,
+        see ScrapeLedger.select_for_scraping
+    :param refresh_rankings: rebuild the local CORE ranking indexes from the portal
+    :param restart: discard the checkpoint of an interrupted run and start from scratch
+    """
+    metrics.reset()
+    if refresh_rankings:
+        refresh_core_ranking_indexes()
+    # archived editions too, a series scraped again before its next CFP is listed matches its archived record
     conference_deadlines = [
-        ConferenceDeadline(**data) for data in load_yaml(yaml_path_conferences)
+        ConferenceDeadline(**data) for data in load_conferences(full=True)
     ]
     conference_masterdatas = [
         ConferenceMasterData(**conf_dict)
         for conf_dict in load_csv(csv_path_master_data)
     ]
-    new_conference_deadlines = scrape_new_conference_deadlines_for_master_data(
-        conference_masterdatas
-    )
-    (
-        new_conference_deadlines,
-        updated_conference_deadlines,
-    ) = update_conference_deadlines(conference_deadlines, new_conference_deadlines)
-
-    save_yaml(
-        yaml_path_conference_new_candidates,
-        [c.as_dict() for c in new_conference_deadlines],
-    )
-    save_yaml(
-        yaml_path_conference_updated_candidates,
-        [c.as_dict() for c in updated_conference_deadlines],
+    ledger = ScrapeLedger(json_path_scrape_ledger)
+    checkpoint = ScrapeCheckpoint(json_path_scrape_checkpoint)
+    if restart or not checkpoint.exists():
+        if not full:
+            conference_masterdatas = ledger.select_for_scraping(
+                conference_masterdatas, conference_deadlines
+            )
+        checkpoint.start([c.title for c in conference_masterdatas])
+        save_yaml(yaml_path_conference_new_candidates, [])
+        save_yaml(yaml_path_conference_updated_candidates, [])
+    else:
+        print(f"Resuming scrape run, {len(checkpoint.done)} series already done")
+    conference_masterdatas_by_title = {c.title: c for c in conference_masterdatas}
+    conference_masterdatas = [
+        conference_masterdatas_by_title[title]
+        for title in checkpoint.pending()
+        if title in conference_masterdatas_by_title
+    ]
+
+    new_conference_deadlines = []
+    updated_count = 0
+    scraped = scrape_conference_deadlines_iter(conference_masterdatas)
+    for (
+        conference,
+        scraped_conference,
+        new_conference,
+        updated_conference,
+    ) in diff_conference_deadlines(
+        conference_deadlines, tqdm.tqdm(scraped, total=len(conference_masterdatas))
+    ):
+        if new_conference is not None:
+            new_conference_deadlines.append(new_conference)
+            append_yaml(yaml_path_conference_new_candidates, [new_conference.as_dict()])
+        if updated_conference is not None:
+            updated_count += 1
+            append_yaml(
+                yaml_path_conference_updated_candidates, [updated_conference.as_dict()]
+            )
+        if isinstance(scraped_conference, ScrapeError):
+            metrics.count("failed_series")
+        else:
+            ledger.record(conference.title, scraped_conference)
+            ledger.save()
+        checkpoint.mark_done(conference.title)
+    checkpoint.finish()
+    report = metrics.report(
+        series=len(conference_masterdatas),
+        new_deadlines=len(new_conference_deadlines),
+        updated_deadlines=updated_count,
     )
+    write_run_report(json_path_scrape_report, report)
+    if prometheus_textfile_path:
+        write_prometheus_textfile(prometheus_textfile_path, report)
     return new_conference_deadlines
 
 
 def scrape_new_conference_deadlines_for_master_data(
     conferences: List[ConferenceMasterData],
 ) -> List[ConferenceDeadline]:
-    new_conference_deadlines = []
-    for conference in tqdm.tqdm(conferences):
-        new_conference_deadline = scrape_new_conference_deadline(conference)
-        if new_conference_deadline is not None:
+    return [
+        new_conference_deadline
+        for _, new_conference_deadline in scrape_conference_deadlines_iter(conferences)
+        if isinstance(new_conference_deadline, ConferenceDeadline)
+    ]
+
+
+def scrape_conference_deadlines_iter(
+    conferences: List[ConferenceMasterData],
+) -> Iterator[
+    Tuple[ConferenceMasterData, Union[ConferenceDeadline, ScrapeError, None]]
+]:
+    """
+    Conferences are scraped concurrently, the requests per host are rate limited by fetch_page.
+    Results are yielded as (conference, scraped deadline, ScrapeError if a page could not be fetched or None
+    if no deadline was found) in the order of conferences.
+    """
+
+    def scrape(conference: ConferenceMasterData):
+        try:
+            return scrape_new_conference_deadline_with_ranking(conference)
+        except ScrapeError as e:
+            return e
+
+    new_conference_deadlines = map_concurrently(scrape, conferences)
+    yield from zip(conferences, new_conference_deadlines)
+
+
+def diff_conference_deadlines(
+    conference_deadlines: Union[List[ConferenceDeadline], ConferenceStore],
+    scraped: Iterable[
+        Tuple[ConferenceMasterData, Union[ConferenceDeadline, ScrapeError, None]]
+    ],
+) -> Iterator[Tuple[ConferenceMasterData, Union[ConferenceDeadline, ScrapeError, None], ...]]:
+    """
+    Yields (conference, scraped result, new deadline, updated existing deadline) for each scraped conference,
+    the deadlines are None if not applicable
+    """
+    if not isinstance(conference_deadlines, ConferenceStore):
+        conference_deadlines = ConferenceStore(conference_deadlines)
+    for conference, scraped_conference in scraped:
+        new_conference, updated_conference = None, None
+        if isinstance(scraped_conference, ConferenceDeadline):
+            with metrics.stage("diff"):
+                new_conferences, updated_conferences = update_conference_deadlines(
+                    conference_deadlines, [scraped_conference]
+                )
+            new_conference = next(iter(new_conferences), None)
+            updated_conference = next(iter(updated_conferences), None)
+        yield conference, scraped_conference, new_conference, updated_conference
+
+
+def scrape_new_conference_deadline_with_ranking(
+    conference: ConferenceMasterData,
+) -> ConferenceDeadline:
+    new_conference_deadline = scrape_new_conference_deadline(conference)
+    if new_conference_deadline is not None:
+        with metrics.stage("ranking"):
             conference_ranking = get_matching_core_ranking(new_conference_deadline)
-            if conference_ranking is not None:
-                new_conference_deadline.ranking = conference_ranking.rank
-                new_conference_deadline.ranking_link = conference_ranking.link
-            new_conference_deadlines.append(new_conference_deadline)
-    return new_conference_deadlines
+        if conference_ranking is None:
+            metrics.count("ranking_not_found")
+        else:
+            new_conference_deadline.ranking = conference_ranking.rank
+            new_conference_deadline.ranking_link = conference_ranking.link
+    return new_conference_deadline
 
 
 def scrape_new_conference_deadline(
     conference: ConferenceMasterData,
-) -> ConferenceDeadline:
+) -> Optional[ConferenceDeadline]:
     """
-    Note: Wee add sleep of 5 seconds, since that is the maximum, see http://wikicfp.com/cfp/data.jsp
+    Note: WikiCFP allows one request every 5 seconds, see http://wikicfp.com/cfp/data.jsp
+    This is enforced per host in fetch_page.
+
+    :raises ScrapeError: the search or the event page could not be fetched
     """
-    conference_candidates = scrape_conference_candidates_from_wikicpf(conference)
-    best_conference_candidates = find_conference_from_candidates(
-        conference, conference_candidates
-    )
+    with metrics.stage("search"):
+        conference_candidates = scrape_conference_candidates_from_wikicpf(conference)
+    with metrics.stage("matching"):
+        best_conference_candidates = find_conference_from_candidates(
+            conference, conference_candidates
+        )
     for conference_data in best_conference_candidates:
-        time.sleep(5)
-        conference_details = extract_data_from_website(conference_data.wikicfp_link)
+        try:
+            with metrics.stage("detail_fetch"):
+                conference_details = extract_data_from_website(
+                    conference_data.wikicfp_link
+                )
+        except Exception as e:
+            print(f"Error: could not open {conference_data.wikicfp_link}: {e}")
+            metrics.count("fetch_errors")
+            raise ScrapeError(conference_data.wikicfp_link) from e
         conference_deadline = convert_wikicfp2deadline(
-            {**conference_details, **conference_data.__dict__}, conference
+            {**conference_details, **dataclasses.asdict(conference_data)}, conference
         )
         return conference_deadline  # currently only use best one
-    time.sleep(5)
 
 
 def update_conference_deadlines(
-    conference_deadlines: List[ConferenceDeadline],
+    conference_deadlines: Union[List[ConferenceDeadline], ConferenceStore],
     new_conference_deadline_candidates: List[ConferenceDeadline],
 ):
+    if not isinstance(conference_deadlines, ConferenceStore):
+        conference_deadlines = ConferenceStore(conference_deadlines)
     updated_conference_deadlines = []
     new_conference_deadlines = []
-    existing_conference_ids = [c.id for c in conference_deadlines]
     for new_conference in new_conference_deadline_candidates:
-        if new_conference.id in existing_conference_ids:
-            existing_entry = [
-                c for c in conference_deadlines if c.id == new_conference.id
-            ][0]
+        existing_entry = conference_deadlines.get(new_conference.id)
+        if existing_entry is not None:
             updated = existing_entry.update_from_candidate(new_conference)
             if updated:
                 updated_conference_deadlines.append(existing_entry)
@@ -117,18 +254,25 @@ def scrape_conference_candidates_from_wikicpf(
     conference: ConferenceMasterData,
 ) -> List[ConferenceCandidateCFP]:
     if conference.wikicfp_link is None or conference.wikicfp_link == "":
-        url = f"http://wikicfp.com/cfp/servlet/tool.search?q={conference.wikicfp_query}&year=f"
+        url = f"{wikicfp_base_url}/cfp/servlet/tool.search?q={conference.wikicfp_query}&year=f"
         table_id = 1
     else:
         url = conference.wikicfp_link
         table_id = 3
 
     try:
-        page = urllib.request.urlopen(url)
+        page = fetch_page(url)
     except Exception as e:
         print(f"Error: could not open {url}: {e}")
-        return []
-    soup = BeautifulSoup(page, "html.parser")
+        metrics.count("fetch_errors")
+        raise ScrapeError(url) from e
+    return parse_conference_candidates(page, table_id)
+
+
+def parse_conference_candidates(
+    page, table_id: int, backend=None
+) -> List[ConferenceCandidateCFP]:
+    soup = parse_html(page, "div", {"class": "contsec"}, backend)
     table = soup.select("div.contsec table")[table_id]
     tables_rows = table.find_all("tr")
     if len(tables_rows) == 0:
@@ -146,7 +290,7 @@ def scrape_conference_candidates_from_wikicpf(
             # year = get_datetime(row_data[2].text.split("-")[0].strip()).year
             conf_data = {
                 "title": row_data[0].text,
-                "wikicfp_link": f"http://wikicfp.com{row_data[0].find_all('a')[0]['href']}",
+                "wikicfp_link": f"{wikicfp_base_url}{row_data[0].find_all('a')[0]['href']}",
                 "full_name": row_data[1].text,
                 "year": year,
                 # 'date': row_data[2].text,
@@ -173,6 +317,7 @@ def find_conference_from_candidates(
         and compute_conference_match_score(conference, c) > 0.8
     ]
     if len(best_candidates) == 0:
+        metrics.count("series_without_candidates")
         print(
             f"WARNING: no candidates found for {conference.title} ({conference.full_name}); \n"
             f"Candidates: {conference_candidates}"
@@ -181,6 +326,11 @@ def find_conference_from_candidates(
 
 
 def extract_data_from_website(url) -> Dict:
+    page = fetch_page(url)
+    return parse_event_page(page, url)
+
+
+def parse_event_page(page, url: str, backend=None) -> Dict:
     def get_data(keyword: str, resources):
         candidates = [
             r for r in resources if r[0].text.strip().lower() == keyword.lower()
@@ -188,8 +338,7 @@ def extract_data_from_website(url) -> Dict:
         if len(candidates) == 1:
             return candidates[0][1].text
 
-    page = urllib.request.urlopen(url)
-    soup = BeautifulSoup(page, "html.parser")
+    soup = parse_html(page, "div", {"class": "contsec"}, backend)
 
     # Extract Conference Info
     table = soup.select("div.contsec table.gglu")[0]
@@ -0,0 +1,113 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Union
+
+from src.scraping.models import ConferenceDeadline
+
+Conference = Union[Dict, ConferenceDeadline]
+
+
+def get_value(conference: Conference, key: str):
+    if isinstance(conference, dict):
+        return conference.get(key)
+    return getattr(conference, key, None)
+
+
+def get_subs(conference: Conference) -> List[str]:
+    """
+    Subs of a record, given as a list or as a comma separated string (e.g. "CV,RO")
+    """
+    subs = get_value(conference, "sub")
+    subs = subs if isinstance(subs, list) else str(subs or "").split(",")
+    return [str(sub).strip() for sub in subs if str(sub).strip()]
+
+
+class ConferenceStore:
+    """
+    Conference records (dicts as loaded from yaml or ConferenceDeadline objects) with hash indexes on id,
+    lowercase id, title, (title, year) and sub.
+    Records keep their insertion order, adding a record with an existing id replaces it in place.
+    The indexes reflect id, title, year and sub of a record when it was added.
+    """
+
+    def __init__(self, conferences: Iterable[Conference] = ()):
+        self.by_id: Dict[str, Conference] = {}
+        self.by_lower_id: Dict[str, Conference] = {}
+        self.by_title: Dict[str, List[Conference]] = defaultdict(list)
+        self.by_title_year: Dict[tuple, List[Conference]] = defaultdict(list)
+        self.by_sub: Dict[str, List[Conference]] = defaultdict(list)
+        self._keys: Dict[str, tuple] = {}
+        for conference in conferences:
+            self.add(conference)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __contains__(self, id: str) -> bool:
+        return id in self.by_id
+
+    def values(self) -> List[Conference]:
+        return list(self.by_id.values())
+
+    def add(self, conference: Conference):
+        id = get_value(conference, "id")
+        if id in self.by_id:
+            self._unindex(id)
+        title, year = get_value(conference, "title"), get_value(conference, "year")
+        subs = get_subs(conference)
+        self.by_id[id] = conference  # an existing id keeps its position
+        self.by_lower_id[str(id).lower()] = conference
+        for index, key in self._index_keys(title, year, subs):
+            index[key].append(conference)
+        self._keys[id] = (title, year, subs)
+
+    def remove(self, id: str):
+        self._unindex(id)
+        del self.by_id[id]
+
+    def _unindex(self, id: str):
+        """
+        Removes the record of id from all indexes except by_id
+        """
+        conference = self.by_id[id]
+        if self.by_lower_id.get(str(id).lower()) is conference:
+            del self.by_lower_id[str(id).lower()]
+        for index, key in self._index_keys(*self._keys.pop(id)):
+            index[key] = [c for c in index[key] if c is not conference]
+
+    def _index_keys(self, title, year, subs) -> List[tuple]:
+        return [(self.by_title, title), (self.by_title_year, (title, year))] + [
+            (self.by_sub, sub) for sub in subs
+        ]
+
+    def get(self, id: str) -> Optional[Conference]:
+        return self.by_id.get(id)
+
+    def get_lower(self, id: str) -> Optional[Conference]:
+        """
+        Record whose id matches id ignoring case
+        """
+        return self.by_lower_id.get(str(id).lower())
+
+    def titles(self) -> List[str]:
+        return [title for title, conferences in self.by_title.items() if conferences]
+
+    def with_title(self, title: str) -> List[Conference]:
+        return list(self.by_title.get(title, []))
+
+    def with_title_and_year(self, title: str, year: int) -> List[Conference]:
+        return list(self.by_title_year.get((title, year), []))
+
+    def with_sub(self, sub: str) -> List[Conference]:
+        return list(self.by_sub.get(sub, []))
+
+    def latest(self, title: str) -> Optional[Conference]:
+        """
+        Newest record of a conference series
+        """
+        conferences = self.by_title.get(title, [])
+        if len(conferences) == 0:
+            return None
+        return max(conferences, key=lambda c: int(get_value(c, "year")))
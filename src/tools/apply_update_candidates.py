@@ -1,13 +1,14 @@
-from src.config import yaml_path_conferences, yaml_path_conference_updated_candidates
-from src.io import load_yaml, save_yaml
+from src.config import yaml_path_conference_updated_candidates
+from src.io import load_conferences, load_yaml, save_conferences
 from src.scraping.models import ConferenceDeadline
+from src.store import ConferenceStore
 
 
 def main():
-    conference_deadlines = [
-        ConferenceDeadline(**data) for data in load_yaml(yaml_path_conferences)
-    ]
-    conference_deadlines = {conf.id: conf for conf in conference_deadlines}
+    # the candidates may update archived records, save_conferences keeps them in the archive
+    conference_deadlines = ConferenceStore(
+        ConferenceDeadline(**data) for data in load_conferences(full=True)
+    )
     conference_deadline_update_candidates = [
         ConferenceDeadline(**data)
         for data in load_yaml(yaml_path_conference_updated_candidates)
@@ -15,15 +16,23 @@ def main():
     conference_deadline_update_candidates = {
         conf.id: conf for conf in conference_deadline_update_candidates
     }
+    skipped = []
     for id, conf in conference_deadline_update_candidates.items():
-        matched_conf = conference_deadlines[id]
-        for key, val in conf.as_dict().items():
-            if key not in matched_conf.as_dict().keys():
+        matched_conf = conference_deadlines.get(id)
+        if matched_conf is None:
+            skipped.append(id)
+            continue
+        existing_keys = matched_conf.as_dict().keys()
+        for key in conf.as_dict().keys():
+            if key not in existing_keys:
                 setattr(matched_conf, key, getattr(conf, key))
+    if skipped:
+        print(
+            f"Warning: skipped {len(skipped)} update candidates without conference record: "
+            + ", ".join(skipped)
+        )
 
-    save_yaml(
-        yaml_path_conferences, [v.as_dict() for _, v in conference_deadlines.items()],
-    )
+    save_conferences([v.as_dict() for v in conference_deadlines])
 
 
 if __name__ == "__main__":
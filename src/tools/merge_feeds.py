@@ -0,0 +1,4 @@
+from src.feeds import merge_feeds
+
+if __name__ == "__main__":
+    merge_feeds()
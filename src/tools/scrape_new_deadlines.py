@@ -1,4 +1,6 @@
-from src.scraping.wikicfp_deadlines import scrape_update_suggestions_from_wikicfp
+import sys
+
+from src.__main__ import main
 
 if __name__ == "__main__":
-    scrape_update_suggestions_from_wikicfp()
+    main(["scrape", *sys.argv[1:]])
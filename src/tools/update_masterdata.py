@@ -1,19 +1,21 @@
-from src.config import csv_path_master_data, yaml_path_conferences
-from src.io import load_csv, save_csv, load_yaml
+from src.config import csv_path_master_data
+from src.io import load_conferences, load_csv, save_csv
+from src.store import ConferenceStore
 
 
-def update_master_data_from_conferences():
-    conferences_data = load_yaml(yaml_path_conferences)
+def update_master_data_from_conferences(full=False):
+    """
+    :param full: also add series which only occur in the conference archive
+    """
+    conferences_data = ConferenceStore(load_conferences(full=full))
     master_data = load_csv(csv_path_master_data)
 
-    titles = set([r["title"] for r in conferences_data])
-    master_data_conference_titles = list(set([c["title"].lower() for c in master_data]))
-    for title in titles:
-        # find matching title
-        confs = [r for r in conferences_data if r["title"] == title]
+    master_data_conference_titles = set([c["title"].lower() for c in master_data])
+    for title in conferences_data.titles():
         # use newest conf entry for update
-        conf = sorted(confs, key=lambda x: int(x["year"]), reverse=True)[0]
+        conf = conferences_data.latest(title)
         if conf["title"].lower() not in master_data_conference_titles:
+            master_data_conference_titles.add(conf["title"].lower())
             master_data.append(
                 {
                     "title": conf.get("title", "").lower(),
@@ -1,54 +1,158 @@
-import pandas as pd
-import yaml
+import csv
+import math
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
 
-from src.io import load_yaml, save_csv
+from src.io import dump_yaml, iter_yaml_records
+
+column_order = [
+    "title",
+    "year",
+    "id",
+    "name",
+    "full_name",
+    "link",
+    "deadline",
+    "abstract_deadline",
+    "timezone",
+    "place",
+    "date",
+    "start",
+    "end",
+    "paperslink",
+    "pwclink",
+    "hindex",
+    "sub",
+    "ranking",
+    "ranking_link",
+    "note",
+    "wikicfp",
+    "wikicfp_comment",
+]
+# A renamed column only fills its target if the target column is empty, e.g. full_name is kept over name
+column_renamings = {"name": "full_name"}
+# Cells read as empty, the default na_values of pandas.read_csv
+na_values = {
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+}
+true_values = {"True", "TRUE", "true"}
+false_values = {"False", "FALSE", "false"}
 
 
 def convert_yaml_to_csv(yaml_path, csv_path):
-    data = load_yaml(yaml_path)
-    save_csv(csv_path, data)
-
-
-def convert_csv_to_yaml(csv_path, yaml_path):
-    data = pd.read_csv(csv_path, encoding="utf-8").fillna("")
-    column_order = [
-        "title",
-        "year",
-        "id",
-        "name",
-        "link",
-        "deadline",
-        "abstract_deadline",
-        "timezone",
-        "place",
-        "date",
-        "start",
-        "end",
-        "paperslink",
-        "pwclink",
-        "hindex",
-        "sub",
-        "ranking",
-        "note",
-        "wikicfp",
+    # The header needs all keys before the first row is written. The yaml is parsed once, collecting
+    # the keys in order of appearance while the records are spooled to a temporary file.
+    keys = {}
+    with tempfile.TemporaryFile(dir=Path(csv_path).parent) as spool:
+        for conf in iter_yaml_records(yaml_path):
+            keys.update(dict.fromkeys(conf))
+            pickle.dump(conf, spool, protocol=pickle.HIGHEST_PROTOCOL)
+        spool.seek(0)
+        with open(csv_path, "w", newline="", encoding="utf-8") as file:
+            dict_writer = csv.DictWriter(file, list(keys))
+            dict_writer.writeheader()
+            dict_writer.writerows(iter_spooled_records(spool))
+
+
+def iter_spooled_records(spool) -> Iterator[Dict]:
+    while True:
+        try:
+            yield pickle.load(spool)
+        except EOFError:
+            return
+
+
+def is_empty(value: str) -> bool:
+    return value is None or value in na_values
+
+
+def is_number(value: str) -> bool:
+    try:
+        return math.isfinite(float(value))
+    except ValueError:
+        return False
+
+
+def to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def to_bool(value: str) -> bool:
+    return value in true_values
+
+
+def get_column_converters(csv_path) -> Dict[str, Callable[[str], object]]:
+    """
+    Converts columns with only numbers to int and columns with only True/False to bool, like the column
+    types read_csv of pandas infers (integers with missing values are floats there, but were converted
+    back to int anyway)
+    """
+    with open(csv_path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        columns = next(reader, [])
+        numeric = [True] * len(columns)
+        boolean = [True] * len(columns)
+        for row in reader:
+            for i, value in enumerate(row[: len(columns)]):
+                if value in na_values:
+                    continue
+                numeric[i] = numeric[i] and is_number(value)
+                boolean[i] = boolean[i] and (value in true_values or value in false_values)
+    return {
+        column: to_int if numeric[i] else to_bool if boolean[i] else str
+        for i, column in enumerate(columns)
+    }
+
+
+def convert_csv_to_yaml(csv_path, yaml_path, batch_size=1000):
+    converters = get_column_converters(csv_path)
+    # columns without a place in column_order follow in the order of the csv
+    columns: List[str] = [name for name in column_order if name in converters] + [
+        name for name in converters if name not in column_order
     ]
-    data = data[
-        [name for name in column_order if name in data.columns]
-    ]  # sort by specified order
-    data = data.rename(columns={"name": "full_name"})  # renamings
-    data = data.to_dict("records")  # to list of dicts
-    for conf in data:
-        del_keys = []
-        for key, val in conf.items():
-            if val == "":
-                del_keys.append(key)
-            if isinstance(val, float):
-                conf[key] = int(val)
-        for key in del_keys:
-            del conf[key]
-
-    with open(yaml_path, "w") as output_file:
-        yaml.safe_dump(data, output_file, sort_keys=False)
+    with open(csv_path, newline="", encoding="utf-8") as input_file, open(
+        yaml_path, "w", encoding="utf-8"
+    ) as output_file:
+        batch, empty = [], True
+        for row in csv.DictReader(input_file):
+            conf = {}
+            for column in columns:  # sort by specified order
+                val = row[column]
+                if is_empty(val):  # drop empty cells
+                    continue
+                key = column_renamings.get(column, column)
+                if key != column and key in converters and not is_empty(row[key]):
+                    continue
+                conf[key] = converters[column](val)
+            batch.append(conf)
+            if len(batch) == batch_size:
+                dump_yaml(batch, output_file)
+                batch, empty = [], False
+        if len(batch) > 0 or empty:
+            dump_yaml(batch, output_file)
 
 
 if __name__ == "__main__":
@@ -3,13 +3,14 @@
 
 # Sort and Clean conference data.
 # It writes to `sorted_data.yml` and `cleaned_data.yml`, copy those to the conference.yml after screening.
+# Run from the repository root: python -m utils.process
 
 import yaml
 import datetime
 import sys
+import time
 from shutil import copyfile
 from builtins import input
-import pytz
 
 import pdb
 
@@ -26,6 +27,9 @@ except ImportError:
     from yaml import Loader, Dumper
 from yaml.representer import SafeRepresenter
 
+from src.config import yaml_path_conferences
+from src.scraping.dates import get_utc_timestamp
+
 _mapping_tag = yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG
 
 
@@ -59,7 +63,7 @@ def ordered_dump(data, stream=None, Dumper=yaml.Dumper, **kwds):
 dateformat = "%Y-%m-%d %H:%M:%S"
 tba_words = ["tba", "tbd"]
 
-right_now = datetime.datetime.utcnow().replace(microsecond=0).strftime(dateformat)
+right_now_timestamp = time.time()
 
 
 # Helper function for yes no questions
@@ -96,7 +100,7 @@ def query_yes_no(question, default="no"):
 
 # Sort:
 
-with open("../_data/conferences.yml", "r") as stream:
+with open(yaml_path_conferences, "r") as stream:
     try:
         data = yaml.load(stream, Loader=Loader)
         print("Initial Sorting:")
@@ -106,34 +110,21 @@ with open("../_data/conferences.yml", "r") as stream:
         conf = [x for x in data if x["deadline"].lower() not in tba_words]
         tba = [x for x in data if x["deadline"].lower() in tba_words]
 
-        # just sort:
-        conf.sort(
-            key=lambda x: pytz.utc.normalize(
-                datetime.datetime.strptime(x["deadline"], dateformat).replace(
-                    tzinfo=pytz.timezone(
-                        x["timezone"]
-                        .replace("UTC+", "Etc/GMT-")
-                        .replace("UTC-", "Etc/GMT+")
-                    )
-                )
+        # UTC deadlines, computed once for both sorts
+        deadlines = {
+            id(x): get_utc_timestamp(
+                datetime.datetime.strptime(x["deadline"], dateformat), x["timezone"]
             )
-        )
+            for x in conf
+        }
+
+        # just sort:
+        conf.sort(key=lambda x: deadlines[id(x)])
         print("Date Sorting:")
         for q in conf + tba:
             print(q["deadline"], " - ", q["title"])
         print("\n\n")
-        conf.sort(
-            key=lambda x: pytz.utc.normalize(
-                datetime.datetime.strptime(x["deadline"], dateformat).replace(
-                    tzinfo=pytz.timezone(
-                        x["timezone"]
-                        .replace("UTC+", "Etc/GMT-")
-                        .replace("UTC-", "Etc/GMT+")
-                    )
-                )
-            ).strftime(dateformat)
-            < right_now
-        )
+        conf.sort(key=lambda x: deadlines[id(x)] < right_now_timestamp)
         print("Date and Passed Deadline Sorting with tba:")
         for q in conf + tba:
             print(q["deadline"], " - ", q["title"])